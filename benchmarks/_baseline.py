@@ -0,0 +1,40 @@
+"""基准测试公用工具：从git历史中加载优化前的模块作为对照组"""
+import os
+import subprocess
+import sys
+import timeit
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def root_commit():
+    """仓库的初始提交（各项优化之前的代码）"""
+    output = subprocess.check_output(['git', 'rev-list', '--max-parents=0', 'HEAD'],
+                                     cwd=REPO_ROOT, text=True)
+    return output.split()[-1]
+
+
+def load_module(path, rev=None, name=None):
+    """用git show取出rev版本的path文件并作为独立模块加载，不影响当前代码
+
+    Args:
+        path: 相对仓库根目录的文件路径，如'protocol/location_security_protocol.py'
+        rev: git版本，默认为初始提交
+        name: 模块名，默认由路径生成并加上baseline_前缀
+    """
+    rev = rev or root_commit()
+    source = subprocess.check_output(['git', 'show', f'{rev}:{path}'], cwd=REPO_ROOT)
+    name = name or 'baseline_' + path[:-3].replace('/', '_')
+    module = types.ModuleType(name)
+    module.__file__ = f'{rev}:{path}'
+    sys.modules[name] = module
+    exec(compile(source, module.__file__, 'exec'), module.__dict__)
+    return module
+
+
+def best_time(func, number, repeat=5):
+    """多次重复取最短耗时，返回单次调用的秒数"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
@@ -0,0 +1,45 @@
+"""CRC-24Q：查表实现与初始提交中两个协议类的逐位循环对比
+
+运行（在仓库根目录）：
+    python benchmarks/bench_crc24q.py
+    python benchmarks/bench_crc24q.py --baseline <git版本>
+
+先校验新旧实现结果一致（含bytes、bytearray、memoryview输入），再按
+数据包常见长度分别计时，输出每次调用的微秒数和加速比。
+"""
+import argparse
+import os
+
+from _baseline import best_time, load_module
+from protocol.crc24q import crc24q, crc24q_bytes
+
+SIZES = (33, 73, 1024, 2860)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', help='对照组的git版本，默认为初始提交')
+    args = parser.parse_args()
+
+    old_security = load_module('protocol/location_security_protocol.py', args.baseline).LocationSecurityProtocol()
+    old_auxiliary = load_module('protocol/auxiliary_location_protocol.py', args.baseline).AuxiliaryLocationProtocol()
+
+    assert crc24q(b'123456789') == 0xCDE703
+    for n in range(200):
+        data = os.urandom(n)
+        expected = old_security._calculate_crc24q(data)
+        assert crc24q_bytes(data) == crc24q_bytes(bytearray(data)) == crc24q_bytes(memoryview(data)) == expected
+        assert crc24q(data) == old_auxiliary._calculate_crc24q(data)
+
+    print(f"{'长度':>6} {'旧(0x02xx)':>12} {'旧(0x01xx)':>12} {'查表':>10} {'加速比':>8}")
+    for size in SIZES:
+        data = os.urandom(size)
+        number = max(20, 100000 // size)
+        old_a = best_time(lambda: old_auxiliary._calculate_crc24q(data), number)
+        old_s = best_time(lambda: old_security._calculate_crc24q(data), number)
+        new = best_time(lambda: crc24q(data), number)
+        print(f"{size:>5}B {old_a * 1e6:>10.1f}us {old_s * 1e6:>10.1f}us {new * 1e6:>8.1f}us {old_a / new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
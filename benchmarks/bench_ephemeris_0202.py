@@ -0,0 +1,43 @@
+"""0x0202 BDS星历：整数位域打包与初始提交中'0'/'1'字符串拼接的实现对比
+
+运行（在仓库根目录）：
+    python benchmarks/bench_ephemeris_0202.py
+    python benchmarks/bench_ephemeris_0202.py --baseline <git版本>
+
+先用随机字段值校验新旧实现的消息内容逐字节一致，再分别计时消息内容打包和
+完整组包（含CRC），输出每秒次数。
+"""
+import argparse
+import random
+
+from _baseline import best_time, load_module
+from protocol.auxiliary_location_protocol import AuxiliaryLocationProtocol
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', help='对照组的git版本，默认为初始提交')
+    parser.add_argument('-n', '--number', type=int, default=5000, help='每轮计时的打包次数')
+    args = parser.parse_args()
+
+    old = load_module('protocol/auxiliary_location_protocol.py', args.baseline).AuxiliaryLocationProtocol()
+    new = AuxiliaryLocationProtocol()
+    names = [name for name, _ in AuxiliaryLocationProtocol.BDS_EPHEMERIS_FIELDS[2:]]
+
+    for _ in range(500):
+        for name in names:
+            value = random.getrandbits(40)
+            setattr(old, name, value)
+            setattr(new, name, value)
+        assert old._serialize_0202_content() == new._serialize_0202_content()
+    old.message_type = new.message_type = AuxiliaryLocationProtocol.MSG_TYPE_0202
+
+    for title, old_func, new_func in (('消息内容', old._serialize_0202_content, new._serialize_0202_content),
+                                      ('完整数据包', old.serialize, new.serialize)):
+        before = best_time(old_func, args.number)
+        after = best_time(new_func, args.number)
+        print(f"{title}: 优化前 {1 / before:,.0f}/s  优化后 {1 / after:,.0f}/s  ({before / after:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""FrameParser：固定缓冲区+memoryview实现与初始提交中接收线程分包循环的突发数据对比
+
+运行（在仓库根目录）：
+    python benchmarks/bench_framer.py
+    python benchmarks/bench_framer.py --megabytes 8
+
+突发数据由各消息类型的数据包和CRC错误的包组成，按不同的块大小送入，最后
+整段一次送入，对比处理整段突发的耗时。对照组是初始提交中SerialReceiveThread
+的分包循环（buffer += data、buffer = buffer[length:]），每取一包都复制剩余
+积压数据。该循环不校验CRC；FrameParser的耗时中包含CRC校验，因此另测一组
+在循环中逐包校验CRC的对照，加速比按这一组计算。
+"""
+import argparse
+import random
+import time
+
+import _baseline  # noqa: F401  把仓库根目录加入sys.path
+from protocol.crc24q import crc24q
+from protocol.framer import FrameParser
+from protocol.location_security_protocol import LocationSecurityProtocol
+
+CHUNK_SIZES = (512, 4096, 65536)
+
+
+def receive_loop(chunks):
+    """初始提交中SerialReceiveThread.run的分包循环，去掉串口和信号，返回全部数据包"""
+    packets = []
+    buffer = b''
+    for data in chunks:
+        buffer += data
+        while len(buffer) >= 9:
+            length = int.from_bytes(buffer[5:7], 'big')
+            if len(buffer) < length:
+                break
+            packet = buffer[:length]
+            packets.append(packet)
+            buffer = buffer[length:]
+    return packets
+
+
+def receive_loop_crc(chunks):
+    """同receive_loop，只保留CRC正确的数据包"""
+    return [packet for packet in receive_loop(chunks) if crc_ok(packet)]
+
+
+def frame_parser(chunks):
+    parser = FrameParser()
+    packets = []
+    for data in chunks:
+        packets += parser.feed(data)
+    return packets
+
+
+def make_burst(megabytes):
+    protocol = LocationSecurityProtocol()
+    frames = [bytes.fromhex(protocol.serialize(message_type, {}))
+              for message_type in (0x0101, 0x0102, 0x0103, 0x0104, 0x0106)]
+    corrupted = bytearray(frames[0])
+    corrupted[12] ^= 0xFF
+    unit = b''.join(frames) + bytes(corrupted)
+    return unit * (megabytes * 1024 * 1024 // len(unit))
+
+
+def timed(func, chunks, repeat):
+    """返回(最短耗时, 数据包数)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func(chunks))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def crc_ok(packet):
+    return crc24q(packet[:-3]) == int.from_bytes(packet[-3:], 'big')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--megabytes', type=int, default=4, help='突发数据大小（MB）')
+    args = parser.parse_args()
+    burst = make_burst(args.megabytes)
+
+    # 随机块大小下，分包循环中CRC正确的包应与FrameParser输出的包一致
+    sample = burst[:300000]
+    chunks = []
+    i = 0
+    while i < len(sample):
+        size = random.randint(1, 9000)
+        chunks.append(sample[i:i + size])
+        i += size
+    old_packets = receive_loop_crc(chunks)
+    new_packets = frame_parser(chunks)
+    assert old_packets == new_packets
+
+    print(f"突发数据 {len(burst) / 2 ** 20:.1f}MB")
+    for chunk in CHUNK_SIZES + (len(burst),):
+        chunks = [burst[i:i + chunk] for i in range(0, len(burst), chunk)]
+        repeat = 1 if chunk == len(burst) else 3
+        loop, total = timed(receive_loop, chunks, repeat)
+        before, _ = timed(receive_loop_crc, chunks, repeat)
+        after, count = timed(frame_parser, chunks, repeat)
+        title = '整段一次送入' if chunk == len(burst) else f'块大小{chunk:>6}'
+        print(f"{title}: 分包循环 {loop:.3f}s  分包循环+CRC {before:.3f}s  FrameParser {after:.3f}s  "
+              f"({before / after:.1f}x, {total}包，其中CRC正确{count}包)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""LocationSecurityProtocol.serialize：预编译编解码器与初始提交中逐次解析格式串的实现对比
+
+运行（在仓库根目录）：
+    python benchmarks/bench_serialize.py
+    python benchmarks/bench_serialize.py --baseline <git版本>
+
+新旧实现的时间函数固定为常量后，先校验各消息类型的输出逐字节一致，再分别
+计时，输出每秒可组包数。0x0105发送端未实现，只校验其只有包头的输出一致。
+
+初始提交的CRC仍是逐位循环；只看编解码器本身的收益时，用--baseline指定
+CRC改为查表之后、改用预编译编解码器之前的版本。
+"""
+import argparse
+
+from _baseline import best_time, load_module
+from protocol.location_security_protocol import LocationSecurityProtocol
+
+CONTENTS = {
+    0x0101: {'nav_system': 0x21, 'signal_status': 'ABCD', 'satellite_status': '1234567890'},
+    0x0102: {'nav_system': 0x31, 'verification_count': '12', 'satellite_number': '10', 'ref_time': '123456'},
+    0x0103: {'latitude': '1234', 'bandwidth': 'FF', 'intensity': '7'},
+    0x0104: {'latitude': '1234', 'nav_system': 0x41, 'confidence': 'A'},
+    0x0106: {'target_message_type': 0x0103, 'broadcast_mode': 3, 'interval_time': '6', 'offset_time': '2'},
+}
+
+
+def freeze_clock(protocol):
+    """把各导航系统的时间固定为常量，使新旧实现的输出可逐字节比较"""
+    protocol._get_bds_week_and_second = lambda: (1000, 345678)
+    protocol._get_gps_week_and_second = lambda: (2000, 5)
+    protocol._get_galileo_week_and_second = lambda: (1300, 77)
+    protocol._get_glonass_day_second = lambda: 4242
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', help='对照组的git版本，默认为初始提交')
+    parser.add_argument('-n', '--number', type=int, default=20000, help='每轮计时的组包次数')
+    args = parser.parse_args()
+
+    old = load_module('protocol/location_security_protocol.py', args.baseline).LocationSecurityProtocol()
+    new = LocationSecurityProtocol()
+    freeze_clock(old)
+    freeze_clock(new)
+
+    for message_type, content in CONTENTS.items():
+        assert old.serialize(message_type, content) == new.serialize(message_type, content), hex(message_type)
+        assert old.serialize(message_type, {}) == new.serialize(message_type, {}), hex(message_type)
+    assert old.serialize(0x0105, {}) == new.serialize(0x0105, {})
+
+    print(f"{'类型':>6} {'优化前':>12} {'优化后':>12} {'加速比':>8}  (包/秒)")
+    for message_type, content in CONTENTS.items():
+        before = best_time(lambda: old.serialize(message_type, content), args.number)
+        after = best_time(lambda: new.serialize(message_type, content), args.number)
+        print(f"0x{message_type:04X} {1 / before:>12,.0f} {1 / after:>12,.0f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
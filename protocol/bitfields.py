@@ -0,0 +1,64 @@
+"""声明式位域布局，按字段位宽表打包/解包大端字节串中的整数字段"""
+
+
+class BitFieldLayout:
+    """位域布局
+
+    字段按顺序从最高位开始依次排列，总位数不足时低位补0。
+    打包时以Python整数移位累加，最后一次性转换为字节；解包时一次转换为整数，
+    再按同一位宽表移位取掩码得到各字段。
+
+    Args:
+        fields: (字段名, 位宽) 序列
+        total_bits: 总位数（须为8的倍数），默认为各字段位宽之和向上取整到字节
+    """
+
+    def __init__(self, fields, total_bits=None):
+        self.fields = tuple(fields)
+        self.names = tuple(name for name, _ in self.fields)
+        used_bits = sum(width for _, width in self.fields)
+        if total_bits is None:
+            total_bits = (used_bits + 7) // 8 * 8
+        if total_bits % 8 or total_bits < used_bits:
+            raise ValueError("位域总长度必须是8的倍数且不小于各字段位宽之和")
+        self.total_bits = total_bits
+        self.byte_length = total_bits // 8
+        self._pad_bits = total_bits - used_bits
+        self._widths_masks = tuple((width, (1 << width) - 1) for _, width in self.fields)
+        # 解包用：各字段相对于最低位的偏移
+        shifts_masks = []
+        shift = total_bits
+        for width, mask in self._widths_masks:
+            shift -= width
+            shifts_masks.append((shift, mask))
+        self._shifts_masks = tuple(shifts_masks)
+
+    def pack(self, values) -> bytes:
+        """按字段顺序打包整数值，超出位宽的高位被截断
+
+        Args:
+            values: 与fields顺序一致的整数序列
+
+        Returns:
+            bytes: 大端字节串，长度为byte_length
+        """
+        if len(values) != len(self._widths_masks):
+            raise ValueError(f"需要{len(self._widths_masks)}个字段值，实际为{len(values)}个")
+        acc = 0
+        for (width, mask), value in zip(self._widths_masks, values):
+            acc = (acc << width) | (value & mask)
+        return (acc << self._pad_bits).to_bytes(self.byte_length, 'big')
+
+    def unpack(self, data) -> tuple:
+        """按字段顺序解包为无符号整数
+
+        Args:
+            data: 长度为byte_length的bytes、bytearray或memoryview
+
+        Returns:
+            tuple: 与fields顺序一致的整数值
+        """
+        if len(data) != self.byte_length:
+            raise ValueError(f"位域数据长度必须为{self.byte_length}字节")
+        acc = int.from_bytes(data, 'big')
+        return tuple([(acc >> shift) & mask for shift, mask in self._shifts_masks])
@@ -0,0 +1,147 @@
+"""CRC-24Q校验（RTCM3.2标准），查表实现，供各协议类和接收端共用"""
+
+CRC24Q_POLY = 0x1864CFB  # CRC-24Q 多项式
+CRC24Q_MASK = 0xFFFFFF   # 24位掩码
+
+
+def _build_table():
+    """生成单字节查表（256项）"""
+    table = []
+    for i in range(256):
+        crc = i << 16
+        for _ in range(8):
+            crc <<= 1
+            if crc & 0x1000000:
+                crc ^= CRC24Q_POLY
+        table.append(crc & CRC24Q_MASK)
+    return tuple(table)
+
+
+def _build_slice_tables(base, count):
+    """生成slicing-by-N查表：第k张表为字节后跟k个0字节的CRC"""
+    tables = [base]
+    for _ in range(count - 1):
+        prev = tables[-1]
+        tables.append(tuple(((v << 8) & CRC24Q_MASK) ^ base[v >> 16] for v in prev))
+    return tuple(tables)
+
+
+CRC24Q_TABLE = _build_table()
+_SLICE8_TABLES = _build_slice_tables(CRC24Q_TABLE, 8)
+
+
+def crc24q(data, crc: int = 0) -> int:
+    """计算CRC-24Q校验码（slicing-by-8查表）
+
+    Args:
+        data: bytes、bytearray或memoryview
+        crc: 初始值，可传入上一段数据的结果实现分段计算
+
+    Returns:
+        int: 24位校验码
+    """
+    if isinstance(data, memoryview):
+        data = data.cast('B')
+    t0, t1, t2, t3, t4, t5, t6, t7 = _SLICE8_TABLES
+    length = len(data)
+    end = length - (length & 7)
+    # 每次处理8字节：前3字节与当前CRC对齐，其余5字节直接查表
+    for i in range(0, end, 8):
+        crc = (t7[(crc >> 16) ^ data[i]]
+               ^ t6[((crc >> 8) & 0xFF) ^ data[i + 1]]
+               ^ t5[(crc & 0xFF) ^ data[i + 2]]
+               ^ t4[data[i + 3]]
+               ^ t3[data[i + 4]]
+               ^ t2[data[i + 5]]
+               ^ t1[data[i + 6]]
+               ^ t0[data[i + 7]])
+    # 剩余不足8字节按单字节查表
+    for i in range(end, length):
+        crc = ((crc << 8) & CRC24Q_MASK) ^ t0[(crc >> 16) ^ data[i]]
+    return crc
+
+
+def crc24q_bytes(data, crc: int = 0) -> bytes:
+    """计算CRC-24Q校验码，返回3字节大端格式"""
+    return crc24q(data, crc).to_bytes(3, byteorder='big')
+
+
+def crc24q_into(buf, start: int, end: int) -> int:
+    """计算buf[start:end]的CRC-24Q，并原地写入buf[end:end+3]
+
+    用于在预分配缓冲区中直接组包，不产生中间字节串。
+
+    Returns:
+        int: 24位校验码
+    """
+    crc = crc24q(memoryview(buf)[start:end])
+    buf[end] = crc >> 16
+    buf[end + 1] = (crc >> 8) & 0xFF
+    buf[end + 2] = crc & 0xFF
+    return crc
+
+
+_NP_TABLE = None  # numpy版查表，首次批量计算时生成
+
+
+def crc24q_rows(rows):
+    """按行批量计算CRC-24Q（需要numpy）
+
+    逐列查表，每一步同时处理所有行，避免逐帧的Python循环。
+
+    Args:
+        rows: 二维uint8数组，每行一段数据
+
+    Returns:
+        numpy.ndarray: 每行的24位校验码（uint32）
+    """
+    global _NP_TABLE
+    import numpy as np
+    if _NP_TABLE is None:
+        _NP_TABLE = np.array(CRC24Q_TABLE, dtype=np.uint32)
+    rows = np.asarray(rows, dtype=np.uint8)
+    if rows.ndim != 2:
+        raise ValueError("批量计算CRC需要二维数组（每行一帧）")
+    crc = np.zeros(rows.shape[0], dtype=np.uint32)
+    for col in range(rows.shape[1]):
+        index = (crc >> 16) ^ rows[:, col]
+        crc = ((crc << 8) & CRC24Q_MASK) ^ _NP_TABLE[index]
+    return crc
+
+
+class Crc24Q:
+    """CRC-24Q增量计算上下文，接口与hashlib一致（update/digest/hexdigest/copy）
+
+    数据可分段送入，无需先拼接成完整数据包：
+        ctx = Crc24Q(header)
+        ctx.update(chunk)
+        ctx.digest()  # 3字节大端
+    """
+    name = 'crc24q'
+    digest_size = 3
+    block_size = 1
+
+    __slots__ = ('_crc',)
+
+    def __init__(self, data=b'', crc: int = 0):
+        self._crc = crc & CRC24Q_MASK
+        if data:
+            self.update(data)
+
+    def update(self, data):
+        """追加数据（bytes、bytearray或memoryview）"""
+        self._crc = crc24q(data, self._crc)
+
+    @property
+    def value(self) -> int:
+        """当前的24位校验值"""
+        return self._crc
+
+    def digest(self) -> bytes:
+        return self._crc.to_bytes(3, byteorder='big')
+
+    def hexdigest(self) -> str:
+        return f"{self._crc:06x}"
+
+    def copy(self) -> 'Crc24Q':
+        return Crc24Q(crc=self._crc)
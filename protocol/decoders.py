@@ -0,0 +1,71 @@
+"""数据包解码：把消息内容字节解码为带字段名的记录（namedtuple），不做任何格式化
+
+显示用的文本由界面按需从记录生成，日志、统计等可以直接使用记录中的数值。
+各消息类型的记录类型和解码函数由protocol.schema中的字段表生成。
+"""
+import struct
+from collections import namedtuple
+from protocol.crc24q import crc24q
+from protocol.schema import SCHEMAS, DecodeError
+
+HEADER_STRUCT = struct.Struct('>IBHH')
+CRC_LENGTH = 3
+
+FrameHeader = namedtuple('FrameHeader', 'identifier version length message_type')
+DecodedFrame = namedtuple('DecodedFrame', 'header content crc_ok')
+
+# 0x0101 卫星导航系统服务状态信息
+ServiceStatus = SCHEMAS[0x0101].record
+# 0x0102 卫星导航系统导航电文验证信息
+NavMessageVerification = SCHEMAS[0x0102].record
+# 0x0103 压制干扰告警信息
+JammingAlert = SCHEMAS[0x0103].record
+JammingEntry = SCHEMAS[0x0103].entry_record('entries')
+# 0x0104 欺骗干扰告警信息
+SpoofingAlert = SCHEMAS[0x0104].record
+SpoofingEntry = SCHEMAS[0x0104].entry_record('entries')
+# 0x0105 模块干扰检测信息，spoofings为欺骗干扰的卫星导航信号元组
+InterferenceDetection = SCHEMAS[0x0105].record
+RaimFault = SCHEMAS[0x0105].entry_record('raim_faults')
+JammingDetection = SCHEMAS[0x0105].entry_record('jammings')
+# 0x0106 信息交互控制指令
+BroadcastControl = SCHEMAS[0x0106].record
+# 0x0201 位置时间辅助信息
+PositionTimeAssist = SCHEMAS[0x0201].record
+# 0x0202 BDS星历辅助信息（有符号字段已按补码还原）
+BdsEphemeris = SCHEMAS[0x0202].record
+
+# 消息类型 -> 消息内容解码函数
+CONTENT_DECODERS = {message_type: schema.decode for message_type, schema in SCHEMAS.items()}
+
+
+def decode_header(frame):
+    """解码包头"""
+    if len(frame) < HEADER_STRUCT.size:
+        raise DecodeError("数据长度不足")
+    return FrameHeader._make(HEADER_STRUCT.unpack_from(frame))
+
+
+def decode_content(message_type, content):
+    """按消息类型解码消息内容（不含包头和CRC）
+
+    Raises:
+        DecodeError: 不支持的消息类型或内容长度不足
+    """
+    decoder = CONTENT_DECODERS.get(message_type)
+    if decoder is None:
+        raise DecodeError(f"不支持的消息类型: 0x{message_type:04X}")
+    return decoder(content)
+
+
+def decode_frame(frame):
+    """解码完整数据包，返回DecodedFrame(包头, 消息内容记录, CRC是否正确)"""
+    header = decode_header(frame)
+    length = header.length
+    if len(frame) < length or length < HEADER_STRUCT.size + CRC_LENGTH:
+        raise DecodeError(f"包长度错误: 包头为{length}字节，实际{len(frame)}字节")
+    view = memoryview(frame)
+    crc_end = length - CRC_LENGTH
+    crc_ok = crc24q(view[:crc_end]) == int.from_bytes(view[crc_end:length], 'big')
+    content = decode_content(header.message_type, view[HEADER_STRUCT.size:crc_end])
+    return DecodedFrame(header, content, crc_ok)
@@ -0,0 +1,113 @@
+import struct
+from protocol.crc24q import crc24q
+from protocol.decoders import decode_content, HEADER_STRUCT, CRC_LENGTH
+from protocol.schema import SCHEMAS
+
+_U8 = struct.Struct('>B')
+_U16 = struct.Struct('>H')
+_U32 = struct.Struct('>I')
+_BDS_TIME = struct.Struct('>HI')
+
+# 消息类型 -> {字段名: (unpack_from, 在包中的偏移)}，导入时由字段表预编译
+_CONTENT_ACCESSORS = {
+    message_type: {name: (struct.Struct(fmt).unpack_from, HEADER_STRUCT.size + offset)
+                   for name, fmt, offset in schema.fixed_layout}
+    for message_type, schema in SCHEMAS.items()
+}
+
+# BDS参考周计数在包中的偏移，周内秒（4字节）紧随其后；只含时间为BDS时间的消息类型，
+# 0x0102的参考时间属于导航系统标识所指的系统，0x0105的参考时间由模块填写，均不在此列
+_BDS_TIME_OFFSETS = {
+    message_type: _CONTENT_ACCESSORS[message_type]['week'][1]
+    for message_type, schema in SCHEMAS.items() if schema.time_base == 'bds'
+}
+
+
+class FrameView:
+    """数据包的零拷贝只读视图
+
+    只保存数据包的memoryview，包头和消息内容字段在访问时才用预编译的
+    Struct.unpack_from从固定偏移读取，不复制、不解码整包；
+    过滤、建索引时只读取实际用到的字节。
+
+    消息内容中位置固定的字段可直接按字段名访问（与protocol.decoders中
+    记录的字段名一致），如view.week、view.target_message_type；
+    变长的条目需要时用decode()完整解码。
+
+    Args:
+        frame: 完整数据包（bytes、bytearray或memoryview），视图有效期内不能修改
+    """
+    __slots__ = ('_view',)
+
+    def __init__(self, frame):
+        self._view = memoryview(frame)
+
+    @property
+    def identifier(self):
+        return _U32.unpack_from(self._view, 0)[0]
+
+    @property
+    def version(self):
+        return _U8.unpack_from(self._view, 4)[0]
+
+    @property
+    def length(self):
+        return _U16.unpack_from(self._view, 5)[0]
+
+    @property
+    def message_type(self):
+        return _U16.unpack_from(self._view, 7)[0]
+
+    @property
+    def content(self):
+        """消息内容（不含包头和CRC）的memoryview"""
+        return self._view[HEADER_STRUCT.size:self.length - CRC_LENGTH]
+
+    @property
+    def crc(self):
+        end = self.length
+        return int.from_bytes(self._view[end - CRC_LENGTH:end], 'big')
+
+    @property
+    def crc_ok(self):
+        return crc24q(self._view[:self.length - CRC_LENGTH]) == self.crc
+
+    @property
+    def bds_time(self):
+        """(BDS参考周计数, 周内秒)，消息类型不含BDS时间时为None
+
+        0x0102等其他时间基准的参考时间仍可按字段名读取（view.week、view.ref_second）。
+        """
+        offset = _BDS_TIME_OFFSETS.get(self.message_type)
+        if offset is None:
+            return None
+        return _BDS_TIME.unpack_from(self._view, offset)
+
+    @property
+    def fields(self):
+        """可按字段名直接访问的消息内容字段"""
+        return tuple(_CONTENT_ACCESSORS.get(self.message_type, ()))
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        accessors = _CONTENT_ACCESSORS.get(self.message_type, {})
+        try:
+            unpack_from, offset = accessors[name]
+        except KeyError:
+            raise AttributeError(
+                f"消息类型0x{self.message_type:04X}没有字段{name}") from None
+        return unpack_from(self._view, offset)[0]
+
+    def decode(self):
+        """完整解码消息内容，返回protocol.decoders中的记录"""
+        return decode_content(self.message_type, self.content)
+
+    def tobytes(self):
+        return self._view[:self.length].tobytes()
+
+    def __len__(self):
+        return len(self._view)
+
+    def __repr__(self):
+        return f"FrameView(message_type=0x{self.message_type:04X}, length={self.length})"
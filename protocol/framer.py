@@ -0,0 +1,181 @@
+from protocol.crc24q import crc24q, Crc24Q
+from protocol.location_security_protocol import LocationSecurityProtocol
+from protocol.schema import SCHEMAS
+
+
+class FrameParser:
+    """按包头中的包长度把串口字节流切分为完整数据包
+
+    包头为标识符(4字节)+版本号(1字节)+包长度(2字节)+消息类型(2字节)，
+    包尾3字节为CRC-24Q。
+
+    收到的数据写入固定大小的bytearray缓冲区，以读写位置标记未处理的数据，
+    取包时只移动读位置并返回memoryview切片，不复制积压数据；写到缓冲区末尾时
+    才把剩余的不完整包（不超过一个包长）移回开头。
+
+    数据流出现丢字节或误码时，用bytes.find查找下一个标识符重新同步；
+    版本号、包长度范围和CRC全部通过才接受一个包，否则从该候选位置的下一字节
+    继续查找，不会因错误的包长度卡住或失步。包长度按消息类型检查（定长消息
+    必须等于字段表长度，0x0105在k、n、m取0~255时的范围内），错误的包长度在
+    包头到达时即被丢弃，不必等到按错误长度收齐数据再由CRC发现。
+
+    长包分多次到达时，已到达的部分先用Crc24Q增量计入CRC，包收齐时只需计算
+    最后一段，校验耗时分摊到各次feed，不集中在收齐的那一次。
+
+    Args:
+        capacity: 缓冲区大小，不小于max_length
+        max_length: 接受的最大包长度，超出视为包头错误；默认为字段表中最长的包长度
+        length_ranges: {消息类型: (最小包长度, 最大包长度)}，默认由字段表生成；
+            表中没有的消息类型只检查MIN_PACKAGE_LENGTH~max_length
+    """
+    HEADER_LENGTH = 9
+    CRC_LENGTH = 3
+    MIN_PACKAGE_LENGTH = HEADER_LENGTH + CRC_LENGTH
+    DEFAULT_CAPACITY = 1 << 17
+    SYNC = LocationSecurityProtocol.FIXED_IDENTIFIER.to_bytes(4, 'big')
+    VERSION = LocationSecurityProtocol.FIXED_VERSION
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, max_length=None, length_ranges=None):
+        if max_length is None:
+            max_length = self.DEFAULT_MAX_LENGTH
+        if not self.MIN_PACKAGE_LENGTH <= max_length <= 0xFFFF:
+            raise ValueError(f"最大包长度须在{self.MIN_PACKAGE_LENGTH}~65535字节之间")
+        if capacity < max_length:
+            raise ValueError(f"缓冲区大小不能小于最大包长度{max_length}字节")
+        self.max_length = max_length
+        self.length_ranges = self.LENGTH_RANGES if length_ranges is None else length_ranges
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._start = 0  # 未处理数据的起始位置
+        self._end = 0    # 未处理数据的结束位置
+        self.frames = 0
+        self.crc_errors = 0
+        self.header_errors = 0    # 标识符之后版本号或包长度不合法的次数
+        self.resyncs = 0          # 查找标识符重新同步的次数
+        self.discarded_bytes = 0  # 重新同步时丢弃的字节数
+        self._hunting = False     # 是否正在查找标识符
+        self._partial_crc = None  # 未收齐的包已计入CRC的部分（Crc24Q）
+        self._partial_fed = 0     # 未收齐的包已计入CRC的字节数
+
+    @property
+    def pending(self):
+        """缓冲区中尚未组成完整数据包的字节数"""
+        return self._end - self._start
+
+    def feed(self, data):
+        """送入新收到的字节，返回其中完整且CRC正确的数据包列表"""
+        return [bytes(frame) for frame in self.feed_views(data)]
+
+    def feed_views(self, data):
+        """送入新收到的字节，逐个产生完整且CRC正确的数据包
+
+        产生的是缓冲区的memoryview，只在生成器继续执行前有效，
+        需要保留时由调用方自行bytes()复制。
+        """
+        data = memoryview(data)
+        size = len(data)
+        pos = 0
+        while pos < size:
+            if self._end == len(self._buf):
+                self._compact()
+            n = min(len(self._buf) - self._end, size - pos)
+            self._view[self._end:self._end + n] = data[pos:pos + n]
+            self._end += n
+            pos += n
+            yield from self._frames()
+
+    def _frames(self):
+        buf = self._buf
+        view = self._view
+        sync = self.SYNC
+        length_ranges = self.length_ranges
+        default_range = (self.MIN_PACKAGE_LENGTH, self.max_length)
+        start = self._start
+        end = self._end
+        while end - start >= self.HEADER_LENGTH:
+            if not buf.startswith(sync, start):
+                start = self._resync(start, end)
+                continue
+            length = (buf[start + 5] << 8) | buf[start + 6]
+            minimum, maximum = length_ranges.get((buf[start + 7] << 8) | buf[start + 8], default_range)
+            if (buf[start + 4] != self.VERSION
+                    or not minimum <= length <= maximum
+                    or length > self.max_length):
+                self.header_errors += 1
+                start = self._resync(start, end, skip=1)
+                continue
+            crc_end = start + length - self.CRC_LENGTH
+            if end - start < length:
+                self._update_partial_crc(start, min(end, crc_end))
+                break
+            if self._partial_crc is None:
+                crc = crc24q(view[start:crc_end])
+            else:
+                self._update_partial_crc(start, crc_end)
+                crc = self._partial_crc.value
+                self._partial_crc = None
+            if crc != int.from_bytes(view[crc_end:start + length], 'big'):
+                # 包长度可能本身就是错的，不跳过整包，从下一字节重新查找
+                self.crc_errors += 1
+                start = self._resync(start, end, skip=1)
+                continue
+            frame = view[start:start + length]
+            start += length
+            self._start = start
+            self._hunting = False
+            self.frames += 1
+            yield frame
+        self._start = start
+        if start == end:
+            # 数据已全部处理，直接回到缓冲区开头
+            self._start = self._end = 0
+
+    def _update_partial_crc(self, start, stop):
+        """把从start开始的未收齐包中尚未计入CRC的字节（到stop为止）计入CRC"""
+        if self._partial_crc is None:
+            self._partial_crc = Crc24Q()
+            self._partial_fed = 0
+        fed = start + self._partial_fed
+        if stop > fed:
+            self._partial_crc.update(self._view[fed:stop])
+            self._partial_fed = stop - start
+
+    def _resync(self, start, end, skip=0):
+        """从start+skip开始查找下一个标识符，丢弃其前的字节并返回其位置
+
+        找不到时保留末尾可能是标识符前半部分的3个字节，其余丢弃。
+        """
+        self._partial_crc = None
+        if not self._hunting:
+            self._hunting = True
+            self.resyncs += 1
+        found = self._buf.find(self.SYNC, start + skip, end)
+        if found < 0:
+            found = max(start + skip, end - len(self.SYNC) + 1)
+        self.discarded_bytes += found - start
+        self._start = found
+        return found
+
+    def _compact(self):
+        """把未处理的数据移到缓冲区开头"""
+        pending = self._end - self._start
+        self._buf[:pending] = bytes(self._view[self._start:self._end])
+        self._start = 0
+        self._end = pending
+
+    @classmethod
+    def _schema_length_ranges(cls):
+        overhead = cls.HEADER_LENGTH + cls.CRC_LENGTH
+        return {message_type: (schema.size_range[0] + overhead, schema.size_range[1] + overhead)
+                for message_type, schema in SCHEMAS.items()}
+
+    @staticmethod
+    def message_type(frame):
+        """取数据包的消息类型"""
+        return int.from_bytes(frame[7:9], 'big')
+
+
+# 各消息类型的包长度范围（包头 + 消息内容 + CRC），由字段表生成
+FrameParser.LENGTH_RANGES = FrameParser._schema_length_ranges()
+# 默认接受字段表中最长的包（0x0103有255个压制干扰条目时为4354字节）
+FrameParser.DEFAULT_MAX_LENGTH = max(maximum for _, maximum in FrameParser.LENGTH_RANGES.values())
@@ -1,5 +1,7 @@
 import struct
 from datetime import datetime, timedelta
+from protocol.crc24q import crc24q_bytes, crc24q_into
+from protocol.schema import SCHEMAS
 
 class LocationSecurityProtocol:
     # 固定字段定义
@@ -10,15 +12,9 @@ class LocationSecurityProtocol:
     GALILEO_EPOCH = datetime(1999, 8, 22)  # GALILEO时间起点
     GLONASS_EPOCH = datetime(1996, 1, 1)  # GLONASS时间起点
     
-    # 消息类型定义
-    MESSAGE_TYPES = {
-        0x0101: "卫星导航系统服务状态信息",
-        0x0102: "卫星导航系统导航电文验证信息",
-        0x0103: "压制干扰告警信息",
-        0x0104: "欺骗干扰告警信息",
-        0x0105: "模块干扰检测信息",
-        0x0106: "信息交互控制指令"
-    }
+    # 消息类型定义（0x01xx为定位安全消息）
+    MESSAGE_TYPES = {message_type: schema.description for message_type, schema in SCHEMAS.items()
+                     if message_type >> 8 == 0x01}
     
     # 导航系统标识选项
     NAV_SYSTEM_OPTIONS = {
@@ -117,223 +113,118 @@ class LocationSecurityProtocol:
         
     def _calculate_crc24q(self, data):
         """计算CRC-24Q校验码（RTCM3.2标准）"""
-        crc = 0x000000  # 初始值
-        polynomial = 0x1864CFB  # 多项式
-        for byte in data:
-            crc ^= (byte << 16)  # 左移16位，与CRC高字节对齐
-            for _ in range(8):
-                if crc & 0x800000:  # 检查最高位
-                    crc = (crc << 1) ^ polynomial
-                else:
-                    crc <<= 1
-                crc &= 0xFFFFFF  # 保持24位
-        return crc.to_bytes(3, byteorder='big')  # 转换为3字节大端格式
-        
-    def serialize(self, message_type, message_content):
-        """序列化协议数据为16进制格式"""
-        # 计算包长度：固定头部(4+1+2+2) + 消息内容长度 + CRC长度(3字节)
-        header_length = 4 + 1 + 2 + 2
+        return crc24q_bytes(data)  # 3字节大端格式
         
-        # 根据消息类型序列化不同的内容
-        if message_type == 0x0101:
-            # 获取BDS周计数和周计秒
-            week, second = self._get_bds_week_and_second()
-            
-            # 打包卫星导航系统服务状态消息内容
-            content = struct.pack(
-                '!H I B B 4s 8s 8s',
-                week,                       # 参考周计数 (2字节)
-                second,                     # 参考周计秒 (4字节)
-                message_content.get('nav_system', 0x14),  # 导航系统标识 (1字节)
-                message_content.get('nav_status', 0x00),  # 导航系统状态 (1字节)
-                bytes.fromhex(message_content.get('signal_status', '00000000').zfill(8)[:8]),  # 导航信号状态 (4字节)
-                bytes.fromhex(message_content.get('satellite_status', '0000000000000000').zfill(16)[:16]),  # 导航卫星状态 (8字节)
-                b'\x00\x00\x00\x00\x00\x00\x00\x00'  # 保留字段 (8字节)
-            )
-            
-            # 计算包长度（包含CRC）
-            package_length = header_length + len(content) + 3
-        elif message_type == 0x0102:
-            # 获取导航系统
-            nav_system = message_content.get('nav_system', 0x14)
-            
-            # 根据导航系统获取相应的时间
-            if nav_system in [0x11, 0x12, 0x13, 0x14, 0x15]:  # BDS系统
-                week, second = self._get_bds_week_and_second()
-                time_seconds = second
-            elif nav_system in [0x21, 0x22, 0x23, 0x24]:  # GPS系统
-                week, second = self._get_gps_week_and_second()
-                time_seconds = second
-            elif nav_system in [0x41, 0x42, 0x43, 0x44]:  # GALILEO系统
-                week, second = self._get_galileo_week_and_second()
-                time_seconds = second
-            elif nav_system in [0x31, 0x32, 0x33]:  # GLONASS系统
-                time_seconds = self._get_glonass_day_second()
-                week = 0
-            else:
-                time_seconds = 0
-                week = 0
-                
-            # 打包导航电文验证信息
-            content = struct.pack(
-                '!H I B B B B 3s 3s',
-                week,                       # 参考周计数 (2字节)
-                time_seconds,               # 参考时间 (4字节)
-                nav_system,                 # 导航系统标识 (1字节)
-                int(message_content.get('verification_count', 0)),  # 电文验证信息数N (1字节)
-                int(message_content.get('satellite_number', 0)),    # 卫星号 (1字节)
-                int(message_content.get('message_type', 0x01)),     # 电文类型 (1字节)
-                bytes.fromhex(message_content.get('ref_time', '000000')),  # 电文参考时间 (3字节)
-                bytes.fromhex(message_content.get('verification_word', 'FFFFFF'))  # 电文验证字 (3字节)
-            )
-            
-            # 计算包长度（包含CRC）
-            package_length = header_length + len(content) + 3
-        elif message_type == 0x0103:
-            # 获取BDS周计数和周计秒
-            week, second = self._get_bds_week_and_second()
-            
-            # 打包压制干扰告警信息
-            content = struct.pack(
-                '!H I B 4s 4s 4s H B B B',
-                week,                       # BDS参考周计数 (2字节)
-                second,                     # BDS参考周内秒 (4字节)
-                0x01,                       # 压制干扰数目n (1字节，固定为0x01)
-                bytes.fromhex(message_content.get('latitude', '00000000').zfill(8)),    # 压制干扰纬度 (4字节)
-                bytes.fromhex(message_content.get('longitude', '00000000').zfill(8)),   # 压制干扰经度 (4字节)
-                bytes.fromhex(message_content.get('center_freq', '00000000').zfill(8)), # 压制干扰中心频率 (4字节)
-                int(message_content.get('bandwidth', '0000').zfill(4), 16),             # 压制干扰带宽 (2字节)
-                int(message_content.get('interference_type', 1)),                        # 压制干扰类型 (1字节)
-                int(message_content.get('intensity', '00').zfill(2), 16),               # 压制干扰强度 (1字节)
-                int(message_content.get('confidence', '00').zfill(2), 16)               # 压制干扰置信度 (1字节)
-            )
-            
-            # 计算包长度（包含CRC）
-            package_length = header_length + len(content) + 3
-        elif message_type == 0x0104:
-            # 获取BDS周计数和周计秒
-            week, second = self._get_bds_week_and_second()
-            
-            # 打包欺骗干扰告警信息
-            content = struct.pack(
-                '!H I B 4s 4s B B B',
-                week,                       # BDS参考周计数 (2字节)
-                second,                     # BDS参考周内秒 (4字节)
-                0x01,                       # 欺骗干扰数目m (1字节，固定为0x01)
-                bytes.fromhex(message_content.get('latitude', '00000000').zfill(8)),    # 欺骗干扰纬度 (4字节)
-                bytes.fromhex(message_content.get('longitude', '00000000').zfill(8)),   # 欺骗干扰经度 (4字节)
-                int(message_content.get('effective_distance', '00').zfill(2), 16),      # 欺骗干扰有效距离 (1字节)
-                message_content.get('nav_system', 0x14),                                # 欺骗干扰的卫星导航信号 (1字节)
-                int(message_content.get('confidence', '00').zfill(2), 16)               # 欺骗干扰置信度 (1字节)
-            )
-            
-            # 计算包长度（包含CRC）
-            package_length = header_length + len(content) + 3
-        elif message_type == 0x0106:
-            # 打包信息交互控制指令
-            content = struct.pack(
-                '!H B B B',
-                int(message_content.get('target_message_type', 0x0101)),  # 目标消息类型 (2字节)
-                int(message_content.get('broadcast_mode', 0x00)),         # 播发模式 (1字节)
-                int(message_content.get('interval_time', '00').zfill(2), 16),  # 间隔时间 (1字节)
-                int(message_content.get('offset_time', '00').zfill(2), 16)     # 偏移时间 (1字节)
-            )
-            
-            # 计算包长度（包含CRC）
-            package_length = header_length + len(content) + 3
-        # 0x0202消息类型已移除
+    # 固定头部：标识符(4) + 版本(1) + 包长度(2) + 消息类型(2)
+    HEADER_FORMAT = '!IBHH'
+    HEADER_LENGTH = struct.calcsize(HEADER_FORMAT)
+    CRC_LENGTH = 3
+
+    def _bds_time_fields(self, message_content):
+        """BDS参考周计数和周内秒（字段表中time_base为'bds'的消息）"""
+        week, second = self._get_bds_week_and_second()
+        return {'week': week, 'second': second}
+
+    def _nav_time_fields(self, message_content):
+        """导航电文验证信息的参考周计数和参考时间，按导航系统取相应的时间"""
+        nav_system = message_content.get('nav_system', 0x14)
+
+        if nav_system in [0x11, 0x12, 0x13, 0x14, 0x15]:  # BDS系统
+            week, time_seconds = self._get_bds_week_and_second()
+        elif nav_system in [0x21, 0x22, 0x23, 0x24]:  # GPS系统
+            week, time_seconds = self._get_gps_week_and_second()
+        elif nav_system in [0x41, 0x42, 0x43, 0x44]:  # GALILEO系统
+            week, time_seconds = self._get_galileo_week_and_second()
+        elif nav_system in [0x31, 0x32, 0x33]:  # GLONASS系统
+            time_seconds = self._get_glonass_day_second()
+            week = 0
         else:
-            content = b''
-            package_length = header_length + 3  # 包含CRC长度
-        
-        # 打包固定头部
-        header = struct.pack(
-            '!IBHH',
-            self.FIXED_IDENTIFIER,
-            self.FIXED_VERSION,
-            package_length,
-            message_type
-        )
+            time_seconds = 0
+            week = 0
+        return {'week': week, 'ref_second': time_seconds}
+
+    # 字段表中time_base对应的由程序填写的时间字段，其余字段取自消息内容，
+    # 缺省时使用字段表中的默认值；干扰数目固定为1
+    _TIME_FIELDS = {
+        'bds': _bds_time_fields,
+        'nav': _nav_time_fields,
+    }
+
+    # 发送端尚未实现的消息类型（界面无输入字段），只发送头部；接收端仍按字段表解码
+    UNIMPLEMENTED_TYPES = (0x0105,)
+
+    @classmethod
+    def _build_codec(cls, message_type, schema=None, auto_fields=None):
+        """预编译头部+内容的完整格式，并预先生成固定的头部字段值"""
+        content_format = schema.content_format() if schema is not None else ''
+        frame_struct = struct.Struct(f"{cls.HEADER_FORMAT} {content_format}")
+        package_length = frame_struct.size + cls.CRC_LENGTH
+        header = (cls.FIXED_IDENTIFIER, cls.FIXED_VERSION, package_length, message_type)
+        return frame_struct, header, schema, auto_fields
+
+    def _header_only_codec(self, message_type):
+        """字段表中没有或发送端未实现的消息类型只有头部"""
+        return self._build_codec(message_type)
+
+    def _content_values(self, schema, auto_fields, message_content):
+        if schema is None:
+            return ()
+        overrides = auto_fields(self, message_content) if auto_fields is not None else {}
+        return schema.flat_values(message_content, **overrides)
+
+    def serialize(self, message_type, message_content):
+        """序列化协议数据为16进制格式（用于显示）"""
+        return self.serialize_bytes(message_type, message_content).hex().upper()
+
+    def serialize_bytes(self, message_type, message_content):
+        """序列化协议数据为字节，发送时直接使用，无需16进制往返转换"""
+        # 一次查表得到预编译的格式，一次打包头部和消息内容
+        frame_struct, header, schema, auto_fields = (self._CODECS.get(message_type)
+                                                     or self._header_only_codec(message_type))
+        full_package = frame_struct.pack(*header, *self._content_values(schema, auto_fields, message_content))
 
-        # 组合完整数据包
-        full_package = header + content
-        
         # 为所有消息类型添加CRC
-        crc_bytes = self._calculate_crc24q(full_package)
-        full_package += crc_bytes
-        
-        # 返回16进制字符串表示
-        return full_package.hex().upper()
+        return full_package + self._calculate_crc24q(full_package)
 
-    def get_package_length(self, message_type, content):
-        """计算当前消息的包长度"""
-        header_length = 4 + 1 + 2 + 2  # 标识符(4) + 版本(1) + 包长度(2) + 消息类型(2)
+    def serialize_into(self, buf, offset, message_type, message_content):
+        """将完整数据包（头部、内容和CRC）直接写入调用方提供的缓冲区
 
-        if message_type == 0x0101:
-            # 模拟序列化过程计算内容长度（与serialize方法逻辑一致）
-            signal_status = content.get('signal_status', '00000000').zfill(8)[:8]
-            satellite_status = content.get('satellite_status', '0000000000000000').zfill(16)[:16]
-            content_bytes = struct.pack(
-                '!H I B B 4s 8s 8s',
-                self._get_bds_week_and_second()[0],
-                self._get_bds_week_and_second()[1],
-                content.get('nav_system', 0x14),
-                content.get('nav_status', 0x00),
-                bytes.fromhex(signal_status),
-                bytes.fromhex(satellite_status),
-                b'\x00'*8
-            )
-            return header_length + len(content_bytes) + 3  # +3字节CRC
-        elif message_type == 0x0102:
-            content_bytes = struct.pack(
-                '!H I B B B B 3s 3s',
-                self._get_bds_week_and_second()[0],
-                self._get_bds_week_and_second()[1],
-                content.get('nav_system', 0x14),
-                int(content.get('verification_count', 0)),
-                int(content.get('satellite_number', 0)),
-                int(content.get('message_type', 0x01)),
-                bytes.fromhex(content.get('ref_time', '000000')),
-                bytes.fromhex(content.get('verification_word', 'FFFFFF'))
-            )
-            return header_length + len(content_bytes) + 3  # +3字节CRC
-        elif message_type == 0x0103:
-            content_bytes = struct.pack(
-                '!H I B 4s 4s 4s H B B B',
-                self._get_bds_week_and_second()[0],
-                self._get_bds_week_and_second()[1],
-                0x01,  # 压制干扰数目n (固定为0x01)
-                bytes.fromhex(content.get('latitude', '00000000').zfill(8)),
-                bytes.fromhex(content.get('longitude', '00000000').zfill(8)),
-                bytes.fromhex(content.get('center_freq', '00000000').zfill(8)),
-                int(content.get('bandwidth', '0000').zfill(4), 16),
-                int(content.get('interference_type', 1)),
-                int(content.get('intensity', '00').zfill(2), 16),
-                int(content.get('confidence', '00').zfill(2), 16)
-            )
-            return header_length + len(content_bytes) + 3  # +3字节CRC
-        elif message_type == 0x0104:
-            content_bytes = struct.pack(
-                '!H I B 4s 4s B B B',
-                self._get_bds_week_and_second()[0],
-                self._get_bds_week_and_second()[1],
-                0x01,  # 欺骗干扰数目m (固定为0x01)
-                bytes.fromhex(content.get('latitude', '00000000').zfill(8)),
-                bytes.fromhex(content.get('longitude', '00000000').zfill(8)),
-                int(content.get('effective_distance', '00').zfill(2), 16),
-                content.get('nav_system', 0x14),
-                int(content.get('confidence', '00').zfill(2), 16)
-            )
-            return header_length + len(content_bytes) + 3  # +3字节CRC
-        elif message_type == 0x0106:
-            content_bytes = struct.pack(
-                '!H B B B',
-                int(content.get('target_message_type', 0x0101)),  # 目标消息类型 (2字节)
-                int(content.get('broadcast_mode', 0x00)),         # 播发模式 (1字节)
-                int(content.get('interval_time', '00').zfill(2), 16),  # 间隔时间 (1字节)
-                int(content.get('offset_time', '00').zfill(2), 16)     # 偏移时间 (1字节)
-            )
-            return header_length + len(content_bytes) + 3  # +3字节CRC
-        # 0x0202消息类型已移除
-        else:
-            return header_length + 3  # 其他消息类型只有头部，但也包含CRC
\ No newline at end of file
+        Args:
+            buf: 可写缓冲区（bytearray或可写memoryview）
+            offset: 写入起始位置
+            message_type: 消息类型
+            message_content: 消息内容字典
+
+        Returns:
+            int: 写入的字节数
+        """
+        frame_struct, header, schema, auto_fields = (self._CODECS.get(message_type)
+                                                     or self._header_only_codec(message_type))
+        frame_struct.pack_into(buf, offset, *header,
+                               *self._content_values(schema, auto_fields, message_content))
+
+        # 在缓冲区内原地计算并写入CRC
+        crc_offset = offset + frame_struct.size
+        crc24q_into(buf, offset, crc_offset)
+        return frame_struct.size + self.CRC_LENGTH
+
+    def get_package_length(self, message_type, content=None):
+        """返回消息的包长度（查表，O(1)）
+
+        各消息类型按固定格式打包（0x0103/0x0104的干扰数目固定为1），
+        包长度只取决于消息类型，与内容无关。
+        """
+        return self.PACKAGE_LENGTHS.get(message_type, self.HEADER_LENGTH + self.CRC_LENGTH)
+
+
+# 导入时为每种消息类型构建一次编解码器
+LocationSecurityProtocol._CODECS = {
+    message_type: LocationSecurityProtocol._build_codec(
+        message_type, SCHEMAS[message_type], LocationSecurityProtocol._TIME_FIELDS.get(SCHEMAS[message_type].time_base))
+    for message_type in LocationSecurityProtocol.MESSAGE_TYPES
+    if message_type not in LocationSecurityProtocol.UNIMPLEMENTED_TYPES
+}
+# 各消息类型的包长度（头部 + 消息内容 + CRC），由编解码器预先计算
+LocationSecurityProtocol.PACKAGE_LENGTHS = {
+    message_type: header[2] for message_type, (_, header, _, _) in LocationSecurityProtocol._CODECS.items()
+}
@@ -0,0 +1,110 @@
+import struct
+import time
+from datetime import datetime
+from protocol.crc24q import crc24q
+from protocol.location_security_protocol import LocationSecurityProtocol
+from protocol.schema import SCHEMAS
+
+
+def _build_suffix_tables(suffix):
+    """预计算CRC经过固定后缀数据的线性变换
+
+    CRC-24Q是线性的：从状态s出发处理固定后缀得到的结果 = 从0出发的结果 ^ M(s)，
+    其中M(s)可按s的3个字节分别查表。这样时间字段之后的内容不必每次重新扫描。
+    """
+    base = crc24q(suffix)
+    tables = tuple(
+        tuple(crc24q(suffix, value << shift) ^ base for value in range(256))
+        for shift in (16, 8, 0)
+    )
+    return base, tables
+
+
+class PacketTemplate:
+    """定位安全数据包模板
+
+    按消息类型和内容字典打包一次完整数据包并缓存，每次发送时只改写
+    参考周计数/周内秒这6个字节并增量更新CRC，适合周期播发仿真。
+    0x0102的参考时间按导航系统标识取相应系统的时间（与发送时相同）。
+    """
+    # 消息内容以参考周计数(2字节)和周内秒(4字节)开头、发送时自动填写时间的消息类型
+    TIMED_MESSAGE_TYPES = tuple(message_type for message_type, schema in SCHEMAS.items()
+                                if schema.time_base is not None)
+    TIME_STRUCT = struct.Struct('!HI')
+    WEEK_SECONDS = 7 * 24 * 3600
+
+    def __init__(self, message_type, message_content, protocol=None):
+        self.protocol = protocol or LocationSecurityProtocol()
+        self.message_type = message_type
+        self.message_content = dict(message_content)
+        self._frame = bytearray(self.protocol.serialize_bytes(message_type, self.message_content))
+        self._packet = bytes(self._frame)
+        self._timed = message_type in self.TIMED_MESSAGE_TYPES
+        self._time_base = SCHEMAS[message_type].time_base if self._timed else None
+        self._time = None
+        # 以系统时间推算BDS时间，避免每次发送都构造datetime
+        self._bds_offset = (datetime.now() - self.protocol.BDS_EPOCH).total_seconds() - time.time()
+        if self._timed:
+            self._time_offset = self.protocol.HEADER_LENGTH
+            suffix_offset = self._time_offset + self.TIME_STRUCT.size
+            crc_offset = len(self._frame) - self.protocol.CRC_LENGTH
+            self._time = self.TIME_STRUCT.unpack_from(self._frame, self._time_offset)
+            # 头部不变，缓存其CRC状态；时间字段之后的内容不变，预计算其CRC变换
+            self._prefix_crc = crc24q(memoryview(self._frame)[:self._time_offset])
+            self._suffix_base, self._suffix_tables = _build_suffix_tables(
+                bytes(self._frame[suffix_offset:crc_offset]))
+
+    @property
+    def packet_length(self):
+        return len(self._frame)
+
+    def current_bds_time(self):
+        """返回当前BDS周计数和周内秒"""
+        total = time.time() + self._bds_offset
+        week, second = divmod(int(total), self.WEEK_SECONDS)
+        return week, second
+
+    def current_time(self):
+        """返回本消息当前的参考周计数和周内秒（0x0102为导航系统标识对应系统的时间）"""
+        if self._time_base == 'nav':
+            fields = self.protocol._nav_time_fields(self.message_content)
+            return fields['week'], fields['ref_second']
+        return self.current_bds_time()
+
+    def emit(self, week=None, second=None):
+        """生成一帧数据包
+
+        Args:
+            week: 参考周计数，不指定则使用当前时间
+            second: 参考周内秒，不指定则使用当前时间
+
+        Returns:
+            bytes: 完整数据包
+        """
+        if not self._timed:
+            return self._packet
+        if week is None or second is None:
+            week, second = self.current_time()
+        if (week, second) != self._time:
+            self._patch_time(week, second)
+        return self._packet
+
+    def emit_into(self, buf, offset=0, week=None, second=None):
+        """生成一帧数据包并写入调用方提供的缓冲区，返回写入的字节数"""
+        packet = self.emit(week, second)
+        buf[offset:offset + len(packet)] = packet
+        return len(packet)
+
+    def _patch_time(self, week, second):
+        """改写时间字段并增量计算CRC"""
+        frame = self._frame
+        self.TIME_STRUCT.pack_into(frame, self._time_offset, week, second)
+        state = crc24q(memoryview(frame)[self._time_offset:self._time_offset + self.TIME_STRUCT.size],
+                       self._prefix_crc)
+        high, middle, low = self._suffix_tables
+        crc = self._suffix_base ^ high[state >> 16] ^ middle[(state >> 8) & 0xFF] ^ low[state & 0xFF]
+        frame[-3] = crc >> 16
+        frame[-2] = (crc >> 8) & 0xFF
+        frame[-1] = crc & 0xFF
+        self._time = (week, second)
+        self._packet = bytes(frame)
@@ -0,0 +1,530 @@
+"""消息字段表：各消息类型的字段名、位宽、有无符号、比例因子、默认值和显示名称
+
+打包格式、解码函数、记录类型、位置固定字段的偏移、包长度、发送端自动填写的
+时间字段和接收界面的显示文本都在导入时由SCHEMAS生成，编码、解码、FrameView
+和界面使用同一份定义。新增消息类型在SCHEMAS中增加一项即可收发和显示；
+发送界面中有专用控件（下拉框、联动校验）的输入字段仍按消息类型单独编写。
+"""
+import struct
+from collections import namedtuple
+from protocol.bitfields import BitFieldLayout
+
+
+class DecodeError(ValueError):
+    """消息内容长度不足或格式错误"""
+
+
+_INT_CODES = {8: 'b', 16: 'h', 32: 'i', 64: 'q'}
+
+
+class Field(namedtuple('Field', 'name width signed scale default raw label display base')):
+    """消息字段
+
+    Args:
+        name: 字段名，None表示填充位（不出现在记录中，打包为0）
+        width: 位宽
+        signed: 是否为有符号数（补码）
+        scale: 比例因子，物理量 = 原始值 * scale
+        default: 编码时消息内容中缺少该字段使用的值
+        raw: 按原始字节处理，不解释为整数（位宽须为8的倍数）
+        label: 界面显示名称
+        display: 界面显示方式，'hex'为十六进制，'dec'为十进制
+        base: 字符串输入的进制，默认与display一致（'dec'为10，否则为16）
+    """
+    __slots__ = ()
+
+    def __new__(cls, name, width, signed=False, scale=1, default=0, raw=False, label=None, display='hex',
+                base=None):
+        if base is None:
+            base = 10 if display == 'dec' else 16
+        return super().__new__(cls, name, width, signed, scale, default, raw, label or name, display, base)
+
+    @property
+    def format(self):
+        """struct格式字符（仅按字节对齐的消息使用）"""
+        if self.raw:
+            if self.width % 8:
+                raise ValueError(f"字段{self.name}按字节处理时位宽须为8的倍数")
+            return f"{self.width // 8}s"
+        code = _INT_CODES.get(self.width)
+        if code is None:
+            raise ValueError(f"字段{self.name}的位宽{self.width}不能按字节对齐打包")
+        return code if self.signed else code.upper()
+
+    @property
+    def minimum(self):
+        return -(1 << (self.width - 1)) if self.signed else 0
+
+    def wrap(self, value):
+        """把整数截断到位宽，有符号字段按补码还原为负数（与解码结果一致）"""
+        mask = (1 << self.width) - 1
+        sign_bit = 1 << (self.width - 1) if self.signed else 0
+        return ((value & mask) ^ sign_bit) - sign_bit
+
+    def physical(self, value):
+        """原始值换算为物理量"""
+        return value * self.scale
+
+    def converter(self):
+        """生成把输入值转换为打包值的函数
+
+        字符串按base进制解析（与界面输入一致），整数可以是有符号值，
+        也可以是位宽内的补码；超出位宽时抛出ValueError。
+        """
+        name, width, default = self.name, self.width, self.default
+        if self.raw:
+            size = width // 8
+
+            def convert(value):
+                if value is None:
+                    value = default
+                if isinstance(value, str):
+                    value = bytes.fromhex(value.zfill(size * 2)[:size * 2])
+                elif isinstance(value, int):
+                    value = value.to_bytes(size, 'big')
+                if len(value) != size:
+                    raise ValueError(f"字段{name}须为{size}字节")
+                return bytes(value)
+            return convert
+
+        minimum = self.minimum
+        base = self.base
+        sign_bit = 1 << (width - 1) if self.signed else None
+        modulus = 1 << width
+
+        def convert(value):
+            if value is None:
+                value = default
+            if isinstance(value, str):
+                value = int(value or '0', base)
+            if value < minimum or value >= modulus:
+                raise ValueError(f"字段{name}的值{value}超出{width}位范围")
+            if sign_bit is not None and value >= sign_bit:
+                value -= modulus
+            return value
+        return convert
+
+
+# 数目字段 + 数目个条目；条目只有一个字段时解码为该字段值的元组，label为数目字段的显示名称
+Group = namedtuple('Group', 'count name record fields label', defaults=(None,))
+
+_COUNT_FORMAT = 'B'
+
+
+class MessageSchema:
+    """一种消息类型的字段表及由其生成的编解码器
+
+    items为Field和Group的序列。按字节对齐的消息用struct打包，各段预编译为
+    struct.Struct；指定total_bits的消息按位域打包（BitFieldLayout）。
+
+    Args:
+        message_type: 消息类型
+        description: 消息类型名称
+        record: 解码记录类型名
+        items: 字段表
+        total_bits: 按位域打包时的总位数
+        time_base: 发送时自动填写的时间字段，'bds'为BDS参考周计数和周内秒
+            （week、second），'nav'为按导航系统标识取的参考周计数和参考时间
+            （week、ref_second），None表示不自动填写
+        aliases: 编码时兼容的旧字段名 {旧名: 字段名}
+    """
+
+    def __init__(self, message_type, description, record, items, total_bits=None,
+                 time_base=None, aliases=None):
+        self.message_type = message_type
+        self.description = description
+        self.time_base = time_base
+        self.aliases = dict(aliases or {})
+        self.items = tuple(items)
+        self.bit_packed = total_bits is not None
+        self.groups = tuple(item for item in self.items if isinstance(item, Group))
+        self._fields = {}
+        names = []
+        for item in self.items:
+            if isinstance(item, Group):
+                names += [item.count, item.name]
+                self._fields[item.count] = Field(item.count, 8, label=item.label, display='dec')
+                for field in item.fields:
+                    self._fields[f"{item.name}.{field.name}"] = field
+            elif item.name is not None:
+                names.append(item.name)
+                self._fields[item.name] = item
+        self.record = namedtuple(record, names)
+        self.entry_records = {
+            group.name: namedtuple(group.record, [field.name for field in group.fields])
+            for group in self.groups if group.record is not None
+        }
+        if self.bit_packed:
+            self._build_bit_codec(total_bits)
+        else:
+            self._build_byte_codec()
+
+    def field(self, name):
+        """按名称取字段，条目字段为"组名.字段名"""
+        return self._fields[name]
+
+    def entry_record(self, name):
+        return self.entry_records[name]
+
+    def decode(self, content):
+        """解码消息内容（不含包头和CRC），返回记录
+
+        Raises:
+            DecodeError: 内容长度不足
+        """
+        return self._decode(content)
+
+    def encode(self, values):
+        """把记录（或同名字段的字典）编码为消息内容字节，各组条目数不限"""
+        if not isinstance(values, dict):
+            values = values._asdict()
+        values = self._resolve_aliases(values)
+        if self.bit_packed:
+            return self.layout.pack(self._bit_values(values.get))
+        flat = []
+        counts = []
+        for item, convert in zip(self.items, self._item_converters):
+            if not isinstance(item, Group):
+                flat.append(convert(values.get(item.name)))
+                continue
+            entries = values.get(item.name, ())
+            counts.append(len(entries))
+            flat.append(len(entries))
+            for entry in entries:
+                if isinstance(entry, dict):
+                    entry = [entry.get(field.name) for field in item.fields]
+                elif not isinstance(entry, tuple):
+                    entry = (entry,)  # 只有一个字段的条目
+                flat += [field_convert(value) for field_convert, value in zip(convert, entry)]
+        # struct模块自身缓存编译过的格式，条目数组合不同的格式无需另行缓存
+        return struct.pack('>' + self.content_format(counts), *flat)
+
+    def content_format(self, counts=None):
+        """消息内容的struct格式（不含字节序前缀），counts为各组条目数，默认各1个"""
+        counts = list(counts) if counts is not None else [1] * len(self.groups)
+        codes = []
+        for item in self.items:
+            if isinstance(item, Group):
+                codes.append(_COUNT_FORMAT)
+                codes += [field.format for field in item.fields] * counts.pop(0)
+            else:
+                codes.append(item.format)
+        return ' '.join(codes)
+
+    def flat_values(self, content, **overrides):
+        """发送端的字段值（按字节对齐的消息）：每组一个条目，条目字段与其他字段同在content中
+
+        按content_format()的顺序返回打包值；overrides优先于content，
+        两者都没有的字段使用默认值，数目字段固定为1。
+        """
+        get = self._resolve_aliases(content).get
+        return [convert(overrides[name] if name in overrides else get(name))
+                for name, convert in self._flat_converters]
+
+    def _resolve_aliases(self, values):
+        """把旧字段名换成字段表中的名称，新旧名称同时出现时以新名称为准"""
+        for old, name in self.aliases.items():
+            if old in values:
+                values = dict(values)
+                value = values.pop(old)
+                values.setdefault(name, value)
+        return values
+
+    @property
+    def size(self):
+        """定长消息内容的字节数，含可变条目时为None"""
+        if self.bit_packed:
+            return self.layout.byte_length
+        return None if self.groups else self._segments[0][0].size
+
+    @property
+    def size_range(self):
+        """消息内容字节数的(最小值, 最大值)，各组条目数为0~255"""
+        if self.bit_packed:
+            return self.layout.byte_length, self.layout.byte_length
+        minimum = sum(fixed_size for fixed_size, _, _, _ in self._plan)
+        maximum = minimum + sum(entry_size * 0xFF for _, entry_size, _, _ in self._plan)
+        return minimum, maximum
+
+    @property
+    def fixed_layout(self):
+        """位置固定的字段: ((字段名, struct格式, 在消息内容中的偏移), ...)
+
+        变长消息只到第一个数目字段为止；按位域打包的消息为空。
+        """
+        return self._fixed_layout
+
+    def _build_byte_codec(self):
+        # 按数目字段把字段表切成若干段：每段为若干固定字段（末尾带数目字段）+ 一组条目
+        segments = []
+        run = []
+        for item in self.items:
+            if isinstance(item, Group):
+                fixed = struct.Struct('>' + ''.join([field.format for field in run] + [_COUNT_FORMAT]))
+                entry = struct.Struct('>' + ''.join(field.format for field in item.fields))
+                record = self.entry_records.get(item.name)
+                make = record._make if record is not None else None
+                segments.append((fixed, item, entry, make))
+                run = []
+            else:
+                run.append(item)
+        if run or not segments:
+            segments.append((struct.Struct('>' + ''.join(field.format for field in run)), None, None, None))
+        self._segments = tuple(segments)
+
+        layout = []
+        offset = 0
+        for item in self.items:
+            if isinstance(item, Group):
+                layout.append((item.count, '>' + _COUNT_FORMAT, offset))
+                break
+            layout.append((item.name, '>' + item.format, offset))
+            offset += item.width // 8
+        self._fixed_layout = tuple(layout)
+
+        self._item_converters = tuple(
+            tuple(field.converter() for field in item.fields) if isinstance(item, Group)
+            else item.converter()
+            for item in self.items)
+        converters = []
+        for item, convert in zip(self.items, self._item_converters):
+            if isinstance(item, Group):
+                converters.append((item.count, lambda value: 1))
+                converters += [(field.name, field_convert)
+                               for field, field_convert in zip(item.fields, convert)]
+            else:
+                converters.append((item.name, convert))
+        self._flat_converters = tuple(converters)
+
+        # 解码用：(固定部分字节数, 条目字节数, 固定部分解包, 条目解包为元组)
+        self._plan = tuple(
+            (fixed.size, entry.size if entry else 0, fixed.unpack_from, self._entry_collector(entry, make))
+            for fixed, _, entry, make in self._segments)
+        self._make = self.record._make
+        if not self.groups:
+            self._decode = self._fixed_decoder(self._segments[0][0])
+        else:
+            self._decode = self._decode_segments
+
+    @staticmethod
+    def _entry_collector(entry, make):
+        """生成把一组条目的字节解包为元组的函数"""
+        if entry is None:
+            return None
+        iter_unpack = entry.iter_unpack
+        if make is not None:
+            return lambda data: tuple(map(make, iter_unpack(data)))
+        if entry.format == '>B':
+            return tuple  # 单字节条目直接由memoryview得到整数
+        return lambda data: tuple([value for value, in iter_unpack(data)])
+
+    def _fixed_decoder(self, fixed):
+        unpack_from = fixed.unpack_from
+        make = self.record._make
+        size = fixed.size
+
+        def decode(content):
+            if len(content) < size:
+                raise DecodeError(f"消息内容长度不足: 需要{size}字节，实际{len(content)}字节")
+            return make(unpack_from(content))
+        return decode
+
+    def _decode_segments(self, content):
+        size = len(content)
+        # 先只读各数目字段算出总长度并检查，再解包各段
+        end = 0
+        for fixed_size, entry_size, _, _ in self._plan:
+            end += fixed_size
+            if size < end:
+                raise DecodeError(self._short_message(content, end, size))
+            if entry_size:
+                end += content[end - 1] * entry_size
+        if size < end:
+            raise DecodeError(self._short_message(content, end, size))
+
+        view = memoryview(content)
+        values = []
+        offset = 0
+        for fixed_size, entry_size, unpack_from, collect in self._plan:
+            values += unpack_from(content, offset)
+            offset += fixed_size
+            if collect is not None:
+                end = offset + content[offset - 1] * entry_size
+                values.append(collect(view[offset:end]))
+                offset = end
+        return self._make(values)
+
+    def _short_message(self, content, required, size):
+        """长度不足时的说明，列出已读到的各组条目数"""
+        counts = []
+        offset = 0
+        for group, (fixed_size, entry_size, _, _) in zip(self.groups, self._plan):
+            offset += fixed_size
+            if offset > size:
+                break
+            count = content[offset - 1]
+            counts.append(f"{group.count}={count}")
+            offset += count * entry_size
+        if counts:
+            return f"消息内容长度不足: {'、'.join(counts)}时至少需要{required}字节，实际{size}字节"
+        return f"消息内容长度不足: 至少需要{required}字节，实际{size}字节"
+
+    def _build_bit_codec(self, total_bits):
+        fields = [item for item in self.items if isinstance(item, Field)]
+        self.layout = BitFieldLayout(((field.name or 'spare', field.width) for field in fields), total_bits)
+        self._bit_fields = tuple(fields)
+        self._converters = tuple(field.converter() for field in fields)
+        self._fixed_layout = ()
+        # 解码用：保留字段的(右移位数, 掩码, 符号位)，(v ^ 符号位) - 符号位 即补码还原，无符号字段符号位为0
+        extract = []
+        shift = total_bits
+        for field in fields:
+            shift -= field.width
+            if field.name is not None:
+                sign_bit = 1 << (field.width - 1) if field.signed else 0
+                extract.append((shift, (1 << field.width) - 1, sign_bit))
+        extract = tuple(extract)
+        byte_length = self.layout.byte_length
+        make = self.record._make
+
+        def decode(content):
+            if len(content) < byte_length:
+                raise DecodeError(f"消息内容长度不足: 需要{byte_length}字节，实际{len(content)}字节")
+            acc = int.from_bytes(memoryview(content)[:byte_length], 'big')
+            return make([(((acc >> shift) & mask) ^ sign_bit) - sign_bit
+                         for shift, mask, sign_bit in extract])
+        self._decode = decode
+
+    def _bit_values(self, get):
+        return [0 if field.name is None else convert(get(field.name))
+                for field, convert in zip(self._bit_fields, self._converters)]
+
+
+
+
+SCHEMAS = {schema.message_type: schema for schema in (
+    MessageSchema(0x0101, "卫星导航系统服务状态信息", 'ServiceStatus', (
+        Field('week', 16, label="BDS参考周计数", display='dec'),
+        Field('second', 32, label="BDS参考周内秒", display='dec'),
+        Field('nav_system', 8, default=0x14, label="导航系统标识"),
+        Field('nav_status', 8, label="导航系统状态"),
+        Field('signal_status', 32, raw=True, label="导航信号状态"),
+        Field('satellite_status', 64, raw=True, label="导航卫星状态"),
+        Field('reserved', 64, raw=True, label="保留字段"),
+    ), time_base='bds'),
+    # 参考周计数和参考时间为导航系统标识所指系统的时间（BDS/GPS/GALILEO周内秒或GLONASS日内秒）
+    MessageSchema(0x0102, "卫星导航系统导航电文验证信息", 'NavMessageVerification', (
+        Field('week', 16, label="参考周计数", display='dec'),
+        Field('ref_second', 32, label="参考时间", display='dec'),
+        Field('nav_system', 8, default=0x14, label="导航系统标识"),
+        Field('verification_count', 8, label="电文验证信息数N", display='dec'),
+        Field('satellite_number', 8, label="卫星号", display='dec'),
+        Field('nav_message_type', 8, default=0x01, label="电文类型", base=10),
+        Field('ref_time', 24, raw=True, label="电文参考时间"),
+        Field('verification_word', 24, raw=True, default=0xFFFFFF, label="电文验证字"),
+    ), time_base='nav', aliases={'message_type': 'nav_message_type'}),
+    MessageSchema(0x0103, "压制干扰告警信息", 'JammingAlert', (
+        Field('week', 16, label="BDS参考周计数", display='dec'),
+        Field('second', 32, label="BDS参考周内秒", display='dec'),
+        Group('count', 'entries', 'JammingEntry', (
+            Field('latitude', 32, signed=True, label="压制干扰纬度"),
+            Field('longitude', 32, signed=True, label="压制干扰经度"),
+            Field('center_freq', 32, label="压制干扰中心频率"),
+            Field('bandwidth', 16, label="压制干扰带宽"),
+            Field('interference_type', 8, default=1, label="压制干扰类型", base=10),
+            Field('intensity', 8, label="压制干扰强度"),
+            Field('confidence', 8, label="压制干扰置信度"),
+        ), label="压制干扰数目n"),
+    ), time_base='bds'),
+    MessageSchema(0x0104, "欺骗干扰告警信息", 'SpoofingAlert', (
+        Field('week', 16, label="BDS参考周计数", display='dec'),
+        Field('second', 32, label="BDS参考周内秒", display='dec'),
+        Group('count', 'entries', 'SpoofingEntry', (
+            Field('latitude', 32, signed=True, label="欺骗干扰纬度"),
+            Field('longitude', 32, signed=True, label="欺骗干扰经度"),
+            Field('effective_distance', 8, label="欺骗干扰有效距离"),
+            Field('nav_system', 8, default=0x14, label="欺骗干扰的卫星导航信号"),
+            Field('confidence', 8, label="欺骗干扰置信度"),
+        ), label="欺骗干扰数目m"),
+    ), time_base='bds'),
+    # 模块输出的检测结果，参考时间由模块填写
+    MessageSchema(0x0105, "模块干扰检测信息", 'InterferenceDetection', (
+        Field('pos_status', 16, label="定位状态"),
+        Field('week', 16, label="参考周计数", display='dec'),
+        Field('second', 32, label="参考周内秒", display='dec'),
+        Field('latitude', 32, signed=True, label="纬度"),
+        Field('longitude', 32, signed=True, label="经度"),
+        Field('height', 32, signed=True, label="大地高"),
+        Field('horizontal_speed', 32, signed=True, label="水平速度"),
+        Field('vertical_speed', 32, signed=True, label="垂直速度"),
+        Field('heading', 32, signed=True, label="运动航向"),
+        Field('hdop', 16, label="水平精度因子"),
+        Field('nav_signal', 32, label="参与定位导航信号"),
+        Field('total_sats', 8, label="参与定位卫星总数", display='dec'),
+        Field('bds_sats', 8, label="参与定位北斗卫星数", display='dec'),
+        Group('raim_count', 'raim_faults', 'RaimFault', (
+            Field('prn', 8, label="故障信号的卫星编号"),
+            Field('signal_id', 8, label="故障信号的信号标识"),
+        ), label="RAIM监测发现的故障信号数k"),
+        Group('jamming_count', 'jammings', 'JammingDetection', (
+            Field('center_freq', 32, label="压制干扰中心频率"),
+            Field('bandwidth', 16, label="压制干扰带宽"),
+            Field('jam_type', 8, label="压制干扰类型"),
+            Field('strength', 8, label="压制干扰强度"),
+        ), label="压制干扰数目n"),
+        Group('spoofing_count', 'spoofings', None, (
+            Field('signal', 8, label="欺骗干扰的卫星导航信号"),
+        ), label="欺骗干扰数目m"),
+    )),
+    MessageSchema(0x0106, "信息交互控制指令", 'BroadcastControl', (
+        Field('target_message_type', 16, default=0x0101, label="目标消息类型", base=10),
+        Field('broadcast_mode', 8, label="播发模式", base=10),
+        Field('interval_time', 8, scale=10, label="间隔时间（单位10秒）"),
+        Field('offset_time', 8, scale=10, label="偏移时间（单位10秒）"),
+    )),
+    MessageSchema(0x0201, "位置时间辅助信息", 'PositionTimeAssist', (
+        Field('pos_x', 32, label="概略位置X"),
+        Field('pos_y', 32, label="概略位置Y"),
+        Field('pos_z', 32, label="概略位置Z"),
+        Field('week', 16, label="当前时间周计数", display='dec'),
+        Field('second', 32, label="当前时间周内秒", display='dec'),
+        Field('pos_error', 16, label="位置误差"),
+        Field('time_error', 16, label="时间误差"),
+        Field('data_flag', 8, label="数据有效标志"),
+        Field('reserved', 8, label="保留字段"),
+    )),
+    # BDS星历按RTCM 1042电文的位宽、符号和比例因子打包，共512位，不足部分低位补0；
+    # 比例因子换算后的单位见各字段注释
+    MessageSchema(0x0202, "BDS星历辅助信息", 'BdsEphemeris', (
+        Field(None, 1),                                                         # 最高位补0
+        Field('message_type', 12, default=0b010000010010, label="电文类型号"),
+        Field('bds_sat_id', 6, label="BDS卫星ID"),
+        Field('bds_week', 13, label="BDS周计数"),
+        Field('bds_urai', 4, label="BDS URAI"),
+        Field('bds_idot', 14, signed=True, scale=2 ** -43, label="BDS IDOT"),     # 半周/秒
+        Field('bds_aode', 5, label="BDS AODE"),
+        Field('bds_toc', 17, scale=2 ** 3, label="BDS Toc"),                      # 秒
+        Field('bds_a2', 11, signed=True, scale=2 ** -66, label="BDS a2"),         # 秒/秒²
+        Field('bds_a1', 22, signed=True, scale=2 ** -50, label="BDS a1"),         # 秒/秒
+        Field('bds_a0', 24, signed=True, scale=2 ** -33, label="BDS a0"),         # 秒
+        Field('bds_aodc', 5, label="BDS AODC"),
+        Field('bds_crs', 18, signed=True, scale=2 ** -6, label="BDS Crs"),        # 米
+        Field('bds_delta_n', 16, signed=True, scale=2 ** -43, label="BDS Δn"),    # 半周/秒
+        Field('bds_m0', 32, signed=True, scale=2 ** -31, label="BDS M0"),         # 半周
+        Field('bds_cuc', 18, signed=True, scale=2 ** -31, label="BDS Cuc"),       # 弧度
+        Field('bds_e', 32, scale=2 ** -33, label="BDS e"),
+        Field('bds_cus', 18, signed=True, scale=2 ** -31, label="BDS Cus"),       # 弧度
+        Field('bds_sqrt_a', 32, scale=2 ** -19, label="BDS 根号a"),               # 米^1/2
+        Field('bds_toe', 17, scale=2 ** 3, label="BDS toe"),                      # 秒
+        Field('bds_cic', 18, signed=True, scale=2 ** -31, label="BDS Cic"),       # 弧度
+        Field('bds_omega0', 32, signed=True, scale=2 ** -31, label="BDS Ω0"),     # 半周
+        Field('bds_cis', 18, signed=True, scale=2 ** -31, label="BDS Cis"),       # 弧度
+        Field('bds_i0', 32, signed=True, scale=2 ** -31, label="BDS i0"),         # 半周
+        Field('bds_crc', 18, signed=True, scale=2 ** -6, label="BDS Crc"),        # 米
+        Field('bds_omega', 32, signed=True, scale=2 ** -31, label="BDS ω"),       # 半周
+        Field('bds_omega_dot', 24, signed=True, scale=2 ** -43, label="BDS OMEGADOT"),  # 半周/秒
+        Field('bds_tgd1', 10, signed=True, scale=0.1, label="BDS TGD1"),          # 纳秒
+        Field('bds_tgd2', 10, signed=True, scale=0.1, label="BDS TGD2"),          # 纳秒
+        Field('bds_health', 1, label="BDS卫星自主健康状态"),
+    ), total_bits=512),
+)}
@@ -0,0 +1,202 @@
+import asyncio
+import collections
+import errno
+import os
+import serial
+from protocol.framer import FrameParser
+
+
+class AioSerialTransport:
+    """基于asyncio的串口收发（Linux）
+
+    串口文件描述符设为非阻塞，由事件循环的add_reader/add_writer驱动读写，
+    一个事件循环即可同时驱动多个串口和调度任务，无需每个串口一个线程。
+
+    用法:
+        transport = await AioSerialTransport.open('/dev/ttyUSB0', 115200)
+        await transport.send(frame)
+        async for frame in transport:
+            ...
+
+    串口读写出错（如USB转串口被拔出时的EIO/ENXIO）时，send()和receive()抛出
+    ConnectionError（__cause__为原始OSError），async for正常结束。
+
+    Args:
+        ser: 已打开的串口对象（需提供fileno()）
+        loop: 事件循环，默认为当前运行的事件循环
+        parser: 分包器，默认为FrameParser
+        max_frames: 未取走的已解析数据包上限，达到后暂停读取串口（背压），
+            一次读取中已解析出的数据包全部保留，取走到上限以下后才恢复读取
+    """
+    READ_SIZE = 65536
+
+    def __init__(self, ser, loop=None, parser=None, max_frames=1024):
+        self.serial = ser
+        self.loop = loop or asyncio.get_running_loop()
+        self.parser = parser or FrameParser()
+        self._fd = ser.fileno()
+        os.set_blocking(self._fd, False)
+        self.max_frames = max_frames
+        self._frames = collections.deque()  # 已解析、未取走的数据包
+        self._frame_waiter = None           # receive()等待新数据包的future
+        self._write_buffer = bytearray()
+        self._drain_waiters = []
+        self._writing = False
+        self._reading = False
+        self._closed = False
+        self._error = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self._resume_reading()
+
+    @classmethod
+    async def open(cls, port, baudrate, **settings):
+        """打开串口并创建传输对象"""
+        ser = serial.Serial(port, baudrate, timeout=0, **settings)
+        return cls(ser)
+
+    @property
+    def port(self):
+        return self.serial.port
+
+    async def send(self, frame):
+        """发送一帧数据，数据全部写入串口驱动后返回"""
+        if self._closed:
+            raise ConnectionError("串口已关闭")
+        if self._error is not None:
+            raise self._error
+        if not self._write_buffer:
+            # 先直接写，通常一次即可写完，无需注册写事件
+            try:
+                written = os.write(self._fd, frame)
+            except BlockingIOError:
+                written = 0
+            except OSError as e:
+                self._on_error(e)
+                raise self._error from e
+            self.bytes_sent += written
+            if written == len(frame):
+                return
+            frame = memoryview(frame)[written:]
+        self._write_buffer += frame
+        waiter = self.loop.create_future()
+        # 记录该帧写完时缓冲区应减少到的位置
+        self._drain_waiters.append((self.bytes_sent + len(self._write_buffer), waiter))
+        if not self._writing:
+            self.loop.add_writer(self._fd, self._on_writable)
+            self._writing = True
+        await waiter
+
+    async def receive(self):
+        """等待并返回下一个完整数据包"""
+        while not self._frames:
+            if self._closed or self._error is not None:
+                raise self._error or ConnectionError("串口已关闭")
+            self._frame_waiter = self.loop.create_future()
+            try:
+                await self._frame_waiter
+            finally:
+                self._frame_waiter = None
+        frame = self._frames.popleft()
+        if (not self._reading and len(self._frames) < self.max_frames
+                and not self._closed and self._error is None):
+            self._resume_reading()
+        return frame
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.receive()
+        except ConnectionError:
+            raise StopAsyncIteration
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pause_reading()
+        if self._writing:
+            self.loop.remove_writer(self._fd)
+            self._writing = False
+        self._fail_waiters(ConnectionError("串口已关闭"))
+        self.serial.close()
+        self._wake_receiver()
+
+    def _resume_reading(self):
+        self.loop.add_reader(self._fd, self._on_readable)
+        self._reading = True
+
+    def _pause_reading(self):
+        if self._reading:
+            self.loop.remove_reader(self._fd)
+            self._reading = False
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, self.READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_error(e)
+            return
+        if not data:
+            self._on_error(ConnectionError("串口已断开"))
+            return
+        self.bytes_received += len(data)
+        frames = self.parser.feed(data)
+        if not frames:
+            return
+        # 已从分包器取出的数据包不能再放回，全部保留到receive()取走
+        self._frames.extend(frames)
+        if len(self._frames) >= self.max_frames:
+            # 消费者跟不上时暂停读取，由内核缓冲和硬件流控承接
+            self._pause_reading()
+        self._wake_receiver()
+
+    def _on_writable(self):
+        try:
+            written = os.write(self._fd, self._write_buffer)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_error(e)
+            return
+        del self._write_buffer[:written]
+        self.bytes_sent += written
+        while self._drain_waiters and self._drain_waiters[0][0] <= self.bytes_sent:
+            _, waiter = self._drain_waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+        if not self._write_buffer:
+            self.loop.remove_writer(self._fd)
+            self._writing = False
+
+    def _on_error(self, error):
+        if not isinstance(error, ConnectionError):
+            # EIO等错误说明设备已拔出；统一转为ConnectionError，async for按连接断开正常结束
+            if error.errno not in (None, errno.EIO, errno.ENXIO, errno.EBADF):
+                print(f"串口读写出错: {str(error)}")
+            cause = error
+            error = ConnectionError(f"串口读写出错: {cause}")
+            error.__cause__ = cause
+        self._error = error
+        self._pause_reading()
+        if self._writing:
+            self.loop.remove_writer(self._fd)
+            self._writing = False
+        self._fail_waiters(error)
+        self._wake_receiver()
+
+    def _fail_waiters(self, error):
+        for _, waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+        self._drain_waiters.clear()
+        self._write_buffer.clear()
+
+    def _wake_receiver(self):
+        waiter = self._frame_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
@@ -0,0 +1,283 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from protocol.location_security_protocol import LocationSecurityProtocol
+from protocol.packet_template import PacketTemplate
+from protocol.schema import SCHEMAS
+
+# 播发模式（与LocationSecurityProtocol.BROADCAST_MODE_OPTIONS一致）
+MODE_STOP = 0x00
+MODE_SINGLE = 0x01
+MODE_CONDITIONAL = 0x02
+MODE_PERIODIC = 0x03
+
+# 0x0106信息交互控制指令中间隔时间、偏移时间的单位（秒），即字段表中的比例因子
+CONTROL_TIME_UNIT = SCHEMAS[0x0106].field('interval_time').scale
+
+
+class JitterStats:
+    """发送时刻相对计划时刻的偏差统计（秒，晚于计划为正）"""
+
+    __slots__ = ('count', 'total', 'total_sq', 'min', 'max', 'missed')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.missed = 0  # 因严重滞后而跳过的周期数
+
+    def add(self, lateness):
+        self.count += 1
+        self.total += lateness
+        self.total_sq += lateness * lateness
+        if lateness < self.min:
+            self.min = lateness
+        if lateness > self.max:
+            self.max = lateness
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        if not self.count:
+            return 0.0
+        mean = self.mean
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'missed': self.missed,
+            'mean': self.mean,
+            'std': self.std,
+            'min': self.min if self.count else 0.0,
+            'max': self.max if self.count else 0.0,
+        }
+
+
+class BroadcastJob:
+    """一个播发任务
+
+    Args:
+        message_type: 播发的消息类型
+        message_content: 消息内容字典
+        mode: 播发模式，MODE_SINGLE/MODE_CONDITIONAL/MODE_PERIODIC
+        interval: 周期播发的间隔时间（秒）
+        offset: 首次播发相对任务启动时刻的偏移时间（秒）
+        protocol: 打包使用的协议对象
+    """
+
+    def __init__(self, message_type, message_content, mode=MODE_PERIODIC, interval=0.0, offset=0.0,
+                 protocol=None):
+        if mode not in LocationSecurityProtocol.BROADCAST_MODE_OPTIONS:
+            raise ValueError(f"不支持的播发模式: 0x{mode:02X}")
+        if mode == MODE_PERIODIC and interval <= 0:
+            raise ValueError("周期播发的间隔时间必须大于0")
+        self.message_type = message_type
+        self.mode = mode
+        self.interval = float(interval)
+        self.offset = float(offset)
+        # 打包一次并缓存，每次播发只刷新时间字段
+        self.template = PacketTemplate(message_type, message_content, protocol)
+        self.job_id = None
+        self.start_time = None
+        self.sent = 0
+        self.stats = JitterStats()
+        self._slot = 0        # 下一次播发是第几个周期
+        self._generation = 0  # 任务被移除或重新安排后，堆中的旧条目失效
+
+    @classmethod
+    def from_control(cls, control_content, message_content, protocol=None):
+        """按0x0106信息交互控制指令的内容创建播发任务
+
+        Args:
+            control_content: 0x0106消息内容字典（target_message_type、broadcast_mode、
+                interval_time、offset_time，时间为十六进制字符串，单位10秒）
+            message_content: 目标消息的内容字典
+        """
+        return cls(
+            int(control_content.get('target_message_type', 0x0101)),
+            message_content,
+            mode=int(control_content.get('broadcast_mode', MODE_STOP)),
+            interval=int(control_content.get('interval_time', '00') or '00', 16) * CONTROL_TIME_UNIT,
+            offset=int(control_content.get('offset_time', '00') or '00', 16) * CONTROL_TIME_UNIT,
+            protocol=protocol,
+        )
+
+    def planned_time(self, slot):
+        """第slot次播发的计划时刻（单调时钟），按起点绝对计算，不累积误差"""
+        return self.start_time + self.offset + slot * self.interval
+
+
+class BroadcastScheduler:
+    """播发调度器
+
+    所有任务的下一次播发时刻放在一个最小堆中，后台线程等待堆顶时刻到达后
+    刷新数据包时间字段并调用send发送。周期任务的计划时刻由起点和周期序号
+    直接算出，发送延迟不会累积成漂移；滞后超过一个周期时跳过错过的周期。
+
+    Args:
+        send: 发送函数send(packet_bytes, job)，如DataSender.send_bytes_async的包装
+        clock: 单调时钟函数，默认time.monotonic
+    """
+
+    def __init__(self, send, clock=time.monotonic):
+        self.send = send
+        self.clock = clock
+        self.stats = JitterStats()
+        self._jobs = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    @property
+    def jobs(self):
+        return dict(self._jobs)
+
+    def add_job(self, job, start_time=None):
+        """加入任务并按模式安排首次播发，返回任务编号
+
+        停止播发模式的任务不会被安排；条件触发任务只在trigger()后播发。
+        """
+        with self._cond:
+            job.job_id = next(self._ids)
+            job.start_time = self.clock() if start_time is None else start_time
+            job._slot = 0
+            job._generation += 1
+            if job.mode == MODE_STOP:
+                return job.job_id
+            self._jobs[job.job_id] = job
+            if job.mode in (MODE_SINGLE, MODE_PERIODIC):
+                self._push(job, job.planned_time(0))
+            self._cond.notify()
+        return job.job_id
+
+    def remove_job(self, job_id):
+        """移除任务，堆中的条目在到期时丢弃"""
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                job._generation += 1
+            return job
+
+    def trigger(self, job_id):
+        """触发条件播发任务，在偏移时间后播发一次"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.mode != MODE_CONDITIONAL:
+                return False
+            self._push(job, self.clock() + job.offset)
+            self._cond.notify()
+        return True
+
+    def apply_control(self, control_content, message_content, protocol=None):
+        """按0x0106控制指令更新目标消息类型的播发任务
+
+        先移除该消息类型已有的任务，停止播发模式下不再安排新任务。
+
+        Returns:
+            int或None: 新任务编号
+        """
+        job = BroadcastJob.from_control(control_content, message_content, protocol)
+        # 整个替换过程持有锁，调度线程不会在移除旧任务和加入新任务之间播发
+        with self._cond:
+            for job_id, existing in list(self._jobs.items()):
+                if existing.message_type == job.message_type:
+                    self.remove_job(job_id)
+            if job.mode == MODE_STOP:
+                return None
+            return self.add_job(job)
+
+    def jitter_report(self):
+        """返回总体和各任务的抖动统计"""
+        with self._cond:
+            return {
+                'total': self.stats.as_dict(),
+                'jobs': {job_id: job.stats.as_dict() for job_id, job in self._jobs.items()},
+            }
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_pending(self, now=None):
+        """发送所有已到期的播发，返回下一个计划时刻（无任务时为None）"""
+        due = []
+        with self._cond:
+            if now is None:
+                now = self.clock()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                planned, _, generation, job = heapq.heappop(heap)
+                if generation != job._generation:
+                    continue
+                due.append((planned, job))
+                if job.mode == MODE_PERIODIC:
+                    self._reschedule(job, now)
+                elif job.mode == MODE_SINGLE:
+                    self._jobs.pop(job.job_id, None)
+            next_time = heap[0][0] if heap else None
+
+        for planned, job in due:
+            packet = job.template.emit()
+            lateness = self.clock() - planned
+            try:
+                self.send(packet, job)
+            except Exception as e:
+                print(f"播发消息0x{job.message_type:04X}失败: {str(e)}")
+                continue
+            job.sent += 1
+            job.stats.add(lateness)
+            self.stats.add(lateness)
+        return next_time
+
+    def _push(self, job, planned):
+        heapq.heappush(self._heap, (planned, next(self._seq), job._generation, job))
+
+    def _reschedule(self, job, now):
+        """安排周期任务的下一次播发；滞后超过一个周期时跳到下一个未来时刻"""
+        job._slot += 1
+        planned = job.planned_time(job._slot)
+        if planned <= now:
+            skipped = int((now - planned) // job.interval) + 1
+            job._slot += skipped
+            job.stats.missed += skipped
+            self.stats.missed += skipped
+            planned = job.planned_time(job._slot)
+        self._push(job, planned)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - self.clock()
+                if delay > 0:
+                    # 新任务加入或停止时会提前唤醒
+                    self._cond.wait(delay)
+                    continue
+            self.run_pending()
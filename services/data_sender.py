@@ -1,11 +1,19 @@
 import serial
 from serial.tools import list_ports
+from services.serial_pool import default_pool
+from services.transmit_worker import TransmitWorker
 
 class DataSender:
-    def __init__(self, port=None, baudrate=115200):
-        """初始化数据发送器，可指定串口端口和波特率"""
+    def __init__(self, port=None, baudrate=115200, pool=None, **settings):
+        """初始化数据发送器，可指定串口端口、波特率和串口参数
+
+        串口连接由连接池保持常开，多个发送器和接收线程共用同一连接。
+        """
         self.port = port
         self.baudrate = baudrate
+        self.settings = settings
+        self.pool = pool or default_pool
+        self._worker = None  # 后台发送线程，首次异步发送时创建
 
     @staticmethod
     def list_ports():
@@ -17,16 +25,57 @@ class DataSender:
         Args:
             data_hex (str): 十六进制格式的数据字符串
         """
+        try:
+            # 将十六进制字符串转为字节
+            data_bytes = bytes.fromhex(data_hex)
+        except ValueError as e:
+            print(f"发送数据失败: {str(e)}")
+            return False
+        return self.send_bytes(data_bytes)
+
+    def send_bytes(self, data_bytes):
+        """
+        发送字节数据到串口
+        Args:
+            data_bytes (bytes): 完整的数据包字节
+        """
         if not self.port:
             print("未设置串口，无法发送数据！")
             return False
         try:
-            # 将十六进制字符串转为字节
-            data_bytes = bytes.fromhex(data_hex)
-            with serial.Serial(self.port, self.baudrate, timeout=1) as ser:
-                ser.write(data_bytes)
-                print(f"已发送数据到串口 {self.port}: {data_hex}")
-            return True
-        except Exception as e:
+            self.pool.write(self.port, self.baudrate, data_bytes, **self.settings)
+        except (serial.SerialException, OSError) as e:
             print(f"发送数据失败: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+        print(f"已发送 {len(data_bytes)} 字节到串口 {self.port}")
+        return True
+
+    def send_bytes_async(self, data_bytes, callback=None):
+        """
+        将字节数据放入后台发送队列后立即返回，不阻塞界面线程
+        Args:
+            data_bytes (bytes): 完整的数据包字节
+            callback: 发送完成后调用callback(ok, error)，在发送线程中执行
+        Returns:
+            bool: 是否已入队，未设置串口或队列已满时返回False
+        """
+        if not self.port:
+            print("未设置串口，无法发送数据！")
+            return False
+        if self._worker is None:
+            self._worker = TransmitWorker(self.port, self.baudrate, pool=self.pool, **self.settings)
+        if not self._worker.enqueue(data_bytes, callback):
+            print(f"发送队列已满（{self._worker.queue_capacity}帧），丢弃本帧")
+            return False
+        return True
+
+    @property
+    def queue_depth(self):
+        """后台发送队列中等待发送的帧数"""
+        return self._worker.queue_depth if self._worker is not None else 0
+
+    def close(self, wait=True):
+        """发送完已排队的数据后停止后台发送线程"""
+        if self._worker is not None:
+            self._worker.close(wait)
+            self._worker = None
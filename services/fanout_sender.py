@@ -0,0 +1,84 @@
+import time
+from services.serial_pool import default_pool
+from services.transmit_worker import TransmitWorker
+
+
+class FanoutSender:
+    """多串口广播发送器
+
+    同一数据帧只序列化一次，把同一个bytes对象放入每个串口的发送队列，
+    各串口由各自的后台发送线程并发写入，互不阻塞。
+
+    Args:
+        ports: 串口端口列表
+        baudrate: 波特率
+        pool: 串口连接池，默认为全局连接池
+        maxsize: 每个串口发送队列最多容纳的帧数
+        settings: 其他串口参数
+    """
+
+    def __init__(self, ports, baudrate=115200, pool=None, maxsize=256, **settings):
+        self.baudrate = baudrate
+        self.pool = pool or default_pool
+        self.workers = {
+            port: TransmitWorker(port, baudrate, pool=self.pool, maxsize=maxsize, **settings)
+            for port in dict.fromkeys(ports)
+        }
+        self.dropped = dict.fromkeys(self.workers, 0)  # 各串口因队列满丢弃的帧数
+        self._start_time = None
+
+    @property
+    def ports(self):
+        return list(self.workers)
+
+    def send_bytes(self, data_bytes, callback=None):
+        """把一帧数据发送到全部串口
+
+        Args:
+            data_bytes: 完整的数据包字节
+            callback: 每个串口发送完成后调用callback(port, ok, error)
+
+        Returns:
+            int: 成功入队的串口数
+        """
+        if self._start_time is None:
+            self._start_time = time.monotonic()
+        data_bytes = bytes(data_bytes)  # 各串口共用同一个不可变对象
+        queued = 0
+        for port, worker in self.workers.items():
+            port_callback = None
+            if callback is not None:
+                port_callback = lambda ok, error, port=port: callback(port, ok, error)
+            if worker.enqueue(data_bytes, port_callback):
+                queued += 1
+            else:
+                self.dropped[port] += 1
+        return queued
+
+    def send_message(self, protocol, message_type, message_content, callback=None):
+        """序列化一次消息并发送到全部串口"""
+        return self.send_bytes(protocol.serialize_bytes(message_type, message_content), callback)
+
+    def stats(self):
+        """各串口的发送统计：帧数、失败帧数、丢弃帧数、字节数、写入次数、队列深度和吞吐量"""
+        elapsed = time.monotonic() - self._start_time if self._start_time is not None else 0.0
+        return {
+            port: {
+                'frames_sent': worker.frames_sent,
+                'frames_failed': worker.frames_failed,
+                'frames_dropped': self.dropped[port],
+                'bytes_sent': worker.bytes_sent,
+                'writes': worker.writes,
+                'queue_depth': worker.queue_depth,
+                'bytes_per_second': worker.bytes_sent / elapsed if elapsed else 0.0,
+            }
+            for port, worker in self.workers.items()
+        }
+
+    def close(self, wait=True):
+        """发送完已排队的数据后停止全部发送线程"""
+        for worker in self.workers.values():
+            worker.close(wait=False)
+        if wait:
+            for worker in self.workers.values():
+                worker.join()
@@ -0,0 +1,82 @@
+import itertools
+
+
+class FrameDispatcher:
+    """按消息类型把数据包分发给订阅者
+
+    订阅时即为每个消息类型生成订阅者元组，分发时只做一次字典查找，
+    耗时与订阅者数量无关；没有订阅者的消息类型不复制数据包。
+    订阅者以callback(message_type, frame)形式调用，frame为bytes。
+    """
+
+    def __init__(self):
+        self._subscriptions = {}  # 订阅编号 -> (回调, 消息类型集合或None)
+        self._ids = itertools.count(1)
+        self._routes = {}         # 消息类型 -> 订阅者元组
+        self._wildcard = ()       # 订阅全部类型的订阅者
+        self.dispatched = 0
+        self.unrouted = 0         # 没有订阅者而被丢弃的包数
+
+    def subscribe(self, callback, message_types=None):
+        """订阅消息
+
+        Args:
+            callback: 回调函数callback(message_type, frame)
+            message_types: 订阅的消息类型集合，None表示全部类型
+
+        Returns:
+            int: 订阅编号，用于取消订阅
+        """
+        token = next(self._ids)
+        types = None if message_types is None else frozenset(message_types)
+        self._subscriptions[token] = (callback, types)
+        self._rebuild()
+        return token
+
+    def unsubscribe(self, token):
+        if self._subscriptions.pop(token, None) is not None:
+            self._rebuild()
+
+    @property
+    def message_types(self):
+        """有订阅者的消息类型集合，None表示存在订阅全部类型的订阅者"""
+        if self._wildcard:
+            return None
+        return set(self._routes)
+
+    def wants(self, message_type):
+        return message_type in self._routes or bool(self._wildcard)
+
+    def dispatch(self, frame, message_type=None):
+        """分发一个数据包，返回接收到该包的订阅者数
+
+        Args:
+            frame: 数据包（bytes或memoryview，memoryview会复制一次后再分发）
+            message_type: 消息类型，不指定时从包头读取
+        """
+        if message_type is None:
+            message_type = (frame[7] << 8) | frame[8]
+        callbacks = self._routes.get(message_type, self._wildcard)
+        if not callbacks:
+            self.unrouted += 1
+            return 0
+        if not isinstance(frame, bytes):
+            frame = bytes(frame)
+        for callback in callbacks:
+            callback(message_type, frame)
+        self.dispatched += 1
+        return len(callbacks)
+
+    def _rebuild(self):
+        """重新生成各消息类型的订阅者元组（订阅变化时调用，保持订阅顺序）"""
+        subscriptions = list(self._subscriptions.values())
+        self._wildcard = tuple(callback for callback, types in subscriptions if types is None)
+        all_types = set()
+        for _, types in subscriptions:
+            if types is not None:
+                all_types |= types
+        self._routes = {
+            message_type: tuple(callback for callback, types in subscriptions
+                                if types is None or message_type in types)
+            for message_type in all_types
+        }
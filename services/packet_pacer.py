@@ -0,0 +1,221 @@
+import math
+import threading
+import time
+from functools import partial
+from services.serial_pool import default_pool
+
+# 串口每字节占用的位数：1起始位 + 8数据位 + 1停止位
+BITS_PER_BYTE = 10
+
+
+def wire_time(length, baudrate, bits_per_byte=BITS_PER_BYTE):
+    """按波特率计算length字节在串口线上传输的时间（秒）"""
+    return length * bits_per_byte / baudrate
+
+
+def max_packet_rate(length, baudrate, bits_per_byte=BITS_PER_BYTE):
+    """链路能承载的最大包速率（包/秒）"""
+    return baudrate / (length * bits_per_byte)
+
+
+class TokenBucket:
+    """令牌桶限速
+
+    令牌按rate个/秒持续生成，最多积累burst个，每发送一包消耗一个令牌。
+
+    Args:
+        rate: 令牌生成速率（个/秒）
+        burst: 桶容量，即允许连续发送的最大包数
+        clock: 单调时钟函数
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("速率必须大于0，突发容量至少为1")
+        self.rate = float(rate)
+        self.burst = int(burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self._stamp = clock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def take(self, n, now=None):
+        """最多取走n个令牌，返回实际取到的个数"""
+        if now is None:
+            now = self.clock()
+        self._refill(now)
+        taken = min(int(self.tokens + 1e-9), n)  # 容忍浮点累加误差
+        self.tokens -= taken
+        return taken
+
+    def time_until(self, n=1, now=None):
+        """距离积累到n个令牌还需等待的时间（秒）"""
+        if now is None:
+            now = self.clock()
+        self._refill(now)
+        return max(0.0, (n - self.tokens) / self.rate)
+
+
+class PacerStats:
+    """发送统计"""
+
+    __slots__ = ('frames', 'bytes', 'batches', 'elapsed', 'max_lateness')
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.max_lateness = 0.0  # 帧实际发出时刻相对计划时刻的最大滞后（秒）
+
+    @property
+    def rate(self):
+        """实际包速率（包/秒）"""
+        return self.frames / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'frames': self.frames,
+            'bytes': self.bytes,
+            'batches': self.batches,
+            'elapsed': self.elapsed,
+            'rate': self.rate,
+            'max_lateness': self.max_lateness,
+        }
+
+
+class PacketPacer:
+    """定速发包器
+
+    第i帧的计划时刻为 起点 + i/rate，按绝对时刻计算，长时间运行速率不漂移。
+    同一调度周期（tick）内到期的帧合并为一次send；令牌桶限制滞后后追赶时的
+    突发包数；按波特率累计链路占用时间，链路积压超过一个tick时暂停发送，
+    避免发送速度超过串口实际传输能力。
+
+    Args:
+        send: 发送函数send(data_bytes)，出错时抛出异常
+        rate: 目标包速率（包/秒）
+        baudrate: 串口波特率，用于计算每帧的线上传输时间
+        burst: 令牌桶容量，允许连续发送的最大包数
+        tick: 调度周期（秒），同一周期内到期的帧合并发送
+        clock: 单调时钟函数
+        sleep: 等待函数
+    """
+
+    def __init__(self, send, rate, baudrate, burst=None, tick=0.002, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("包速率必须大于0")
+        self.send = send
+        self.rate = float(rate)
+        self.baudrate = int(baudrate)
+        self.tick = tick
+        self.clock = clock
+        self.sleep = sleep
+        # 默认桶容量容纳10ms（且不少于一个tick）内到期的帧，线程调度滞后时可以追上计划
+        if burst is None:
+            burst = max(2, math.ceil(self.rate * max(tick, 0.01)))
+        self.bucket = TokenBucket(self.rate, burst, clock)
+        self.stats = PacerStats()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_port_widget(cls, serial_port_widget, rate, pool=None, **kwargs):
+        """按串口选择控件当前选中的端口和波特率创建发包器
+
+        直接写入连接池中的串口，不经过DataSender.send_bytes（每次发送都会打印日志）。
+        """
+        port = serial_port_widget.get_selected_port()
+        baudrate = serial_port_widget.get_selected_baudrate()
+        if not port:
+            raise ValueError("未选择串口")
+        pool = pool or default_pool
+        return cls(partial(pool.write, port, baudrate), rate, baudrate, **kwargs)
+
+    def link_limited(self, frame_length):
+        """目标速率是否超过链路能力（超过时实际速率受波特率限制）"""
+        return self.rate > max_packet_rate(frame_length, self.baudrate)
+
+    def run(self, frame_source, count=None, duration=None):
+        """按目标速率发送，直到发送count帧、运行duration秒或调用stop()
+
+        Args:
+            frame_source: 固定的帧数据bytes，或每次调用返回一帧的函数（如PacketTemplate.emit）
+            count: 发送帧数
+            duration: 运行时间（秒）
+
+        Returns:
+            PacerStats: 发送统计
+        """
+        if isinstance(frame_source, (bytes, bytearray)):
+            frame = bytes(frame_source)
+            frame_source = lambda: frame
+        clock = self.clock
+        period = 1.0 / self.rate
+        stop_event = self._stop_event
+        stats = self.stats
+        start = clock()
+        end = start + duration if duration is not None else math.inf
+        link_free = start  # 串口线上已排队数据发送完毕的时刻
+        sent = 0
+        frame_wire = 0.0  # 每帧线上传输时间，发出第一帧后得到
+
+        while not stop_event.is_set():
+            now = clock()
+            if now >= end or (count is not None and sent >= count):
+                break
+            wait = 0.0
+            if link_free - now > self.tick:
+                # 链路积压超过一个tick，等待其发出
+                wait = link_free - now - self.tick
+            else:
+                # 到本tick结束为止应当发出的帧数
+                due = int((now + self.tick - start) / period) + 1 - sent
+                if count is not None:
+                    due = min(due, count - sent)
+                # 一次合并的数据不超过链路在一个tick内能发出的量
+                if frame_wire:
+                    due = min(due, max(1, int((self.tick - max(link_free - now, 0.0)) / frame_wire)))
+                else:
+                    due = min(due, 1)
+                n = self.bucket.take(due, now) if due > 0 else 0
+                if n:
+                    frames = [frame_source() for _ in range(n)]
+                    data = frames[0] if n == 1 else b''.join(frames)
+                    self.send(data)
+                    lateness = now - (start + sent * period)
+                    if lateness > stats.max_lateness:
+                        stats.max_lateness = lateness
+                    sent += n
+                    stats.frames += n
+                    stats.bytes += len(data)
+                    stats.batches += 1
+                    batch_wire = wire_time(len(data), self.baudrate)
+                    frame_wire = batch_wire / n
+                    link_free = max(link_free, now) + batch_wire
+                    continue
+                next_due = start + sent * period - self.tick
+                wait = max(next_due - now, self.bucket.time_until(1, now))
+            wait = min(wait, end - now)
+            if wait > 0.05:
+                stop_event.wait(wait)  # 长时间等待可被stop()打断
+            elif wait > 0:
+                self.sleep(wait)
+
+        stats.elapsed = clock() - start
+        return stats
+
+    def start(self, frame_source, count=None, duration=None):
+        """在后台线程中运行run()"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, args=(frame_source, count, duration), daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,212 @@
+import threading
+import time
+from contextlib import contextmanager
+import serial
+
+
+class PooledConnection:
+    """连接池中的一个串口连接"""
+
+    def __init__(self, key, ser):
+        self.key = key
+        self.serial = ser
+        self.users = 0  # 当前借用者数量
+        self.last_used = time.monotonic()
+        self.write_lock = threading.Lock()  # 多个发送者共用一个串口时保证每次写入完整
+
+    @property
+    def port(self):
+        return self.key[0]
+
+
+class _PendingOpen:
+    """正在打开的串口，其他借用同一端口的线程等待其完成"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class SerialConnectionPool:
+    """串口连接池
+
+    按(端口, 波特率, 串口参数)保持串口常开，供各界面和发送器复用，避免每发一包
+    都重新打开串口。连接出错时由调用方invalidate，下次acquire自动重连；
+    无人使用的连接超过idle_timeout秒后自动关闭。
+
+    打开串口（可能因设备重新枚举或超时而很慢）在连接池锁之外进行，
+    只有借用同一端口的线程等待，其他端口的借用、归还和空闲检查不受影响。
+
+    Args:
+        idle_timeout: 空闲连接的关闭时间（秒），None表示不自动关闭
+        read_timeout: 打开串口时设置的读超时（秒）
+        write_timeout: 打开串口时设置的写超时（秒）
+        serial_factory: 创建串口对象的函数，默认为serial.Serial
+    """
+
+    def __init__(self, idle_timeout=30.0, read_timeout=0.2, write_timeout=1.0, serial_factory=None):
+        self.idle_timeout = idle_timeout
+        self.read_timeout = read_timeout
+        self.write_timeout = write_timeout
+        self._serial_factory = serial_factory or serial.Serial
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._opening = {}  # 端口 -> _PendingOpen
+        self._reaper = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def make_key(port, baudrate, **settings):
+        """生成连接键，settings为bytesize、parity、stopbits等串口参数"""
+        return (port, int(baudrate), tuple(sorted(settings.items())))
+
+    def acquire(self, port, baudrate, **settings):
+        """借用一个连接，不存在或已断开时打开新连接
+
+        Returns:
+            PooledConnection: 使用完毕后须调用release归还
+        """
+        key = self.make_key(port, baudrate, **settings)
+        while True:
+            with self._lock:
+                conn = self._connections.get(key)
+                if conn is not None and not conn.serial.is_open:
+                    del self._connections[key]
+                    conn = None
+                if conn is not None:
+                    conn.users += 1
+                    conn.last_used = time.monotonic()
+                    break
+                pending = self._opening.get(port)
+                if pending is None:
+                    # 占住该端口后在锁外打开
+                    pending = self._opening[port] = _PendingOpen()
+                    # 同一端口以其他参数打开且空闲时先关闭，避免端口被占用
+                    for other_key, other in list(self._connections.items()):
+                        if other.port == port and other.users == 0:
+                            self._close(other_key)
+                    break
+            # 同一端口正由其他线程打开，等待完成后重新查找
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+
+        if conn is None:
+            conn = self._open(key, pending, port, baudrate, **settings)
+        self._ensure_reaper()
+        return conn
+
+    def _open(self, key, pending, port, baudrate, **settings):
+        """在锁外打开串口，完成后发布到连接池并唤醒等待同一端口的线程"""
+        try:
+            ser = self._serial_factory(
+                port, int(baudrate),
+                timeout=self.read_timeout,
+                write_timeout=self.write_timeout,
+                **settings
+            )
+        except Exception as e:
+            pending.error = e
+            raise
+        else:
+            conn = PooledConnection(key, ser)
+            conn.users = 1
+            with self._lock:
+                self._connections[key] = conn
+            return conn
+        finally:
+            with self._lock:
+                del self._opening[port]
+            pending.done.set()
+
+    def release(self, conn):
+        """归还连接"""
+        with self._lock:
+            conn.users = max(conn.users - 1, 0)
+            conn.last_used = time.monotonic()
+
+    def invalidate(self, conn):
+        """连接出错时关闭并移出连接池，下次acquire时重新打开"""
+        with self._lock:
+            if self._connections.get(conn.key) is conn:
+                del self._connections[conn.key]
+        try:
+            conn.serial.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self, port, baudrate, **settings):
+        """以上下文方式借用串口，出现串口错误时自动作废该连接"""
+        conn = self.acquire(port, baudrate, **settings)
+        try:
+            yield conn.serial
+        except (serial.SerialException, OSError):
+            self.invalidate(conn)
+            raise
+        finally:
+            self.release(conn)
+
+    def write(self, port, baudrate, data, **settings):
+        """向串口写入数据，连接失效（如设备拔插）时重新打开串口再试一次
+
+        Raises:
+            serial.SerialException: 重试后仍无法写入
+        """
+        for attempt in range(2):
+            conn = self.acquire(port, baudrate, **settings)
+            try:
+                with conn.write_lock:
+                    conn.serial.write(data)
+                return
+            except (serial.SerialException, OSError):
+                self.invalidate(conn)
+                if attempt:
+                    raise
+            finally:
+                self.release(conn)
+
+    def close_idle(self):
+        """关闭空闲超时的连接"""
+        if self.idle_timeout is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key, conn in list(self._connections.items()):
+                if conn.users == 0 and now - conn.last_used >= self.idle_timeout:
+                    self._close(key)
+
+    def close_all(self):
+        """关闭全部连接并停止空闲检查线程"""
+        self._stop_event.set()
+        with self._lock:
+            for key in list(self._connections):
+                self._close(key)
+            self._reaper = None
+        self._stop_event = threading.Event()
+
+    def _close(self, key):
+        conn = self._connections.pop(key)
+        try:
+            conn.serial.close()
+        except Exception:
+            pass
+
+    def _ensure_reaper(self):
+        """按需启动空闲连接检查线程"""
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap, args=(self._stop_event,), daemon=True)
+            self._reaper.start()
+
+    def _reap(self, stop_event):
+        interval = max(self.idle_timeout / 2, 0.5)
+        while not stop_event.wait(interval):
+            self.close_idle()
+
+
+# 全局共享的串口连接池
+default_pool = SerialConnectionPool()
@@ -0,0 +1,163 @@
+import queue
+import threading
+import time
+import serial
+from services.serial_pool import default_pool
+
+_STOP = object()  # 停止工作线程的哨兵
+
+
+class TransmitWorker:
+    """后台发送线程
+
+    调用方把数据帧放入有界队列后立即返回，工作线程从队列取帧，
+    把已排队的多帧合并成一次write()写入串口，写完后逐帧回调通知结果。
+    队列满时enqueue返回False，调用方可据此感知背压。
+    close()之后不再接受新的数据帧，enqueue同样返回False。
+
+    Args:
+        port: 串口端口
+        baudrate: 波特率
+        pool: 串口连接池，默认为全局连接池
+        maxsize: 队列最多容纳的帧数
+        max_batch_bytes: 一次write()合并的最大字节数
+        settings: 其他串口参数
+    """
+
+    def __init__(self, port, baudrate, pool=None, maxsize=256, max_batch_bytes=4096, **settings):
+        self.port = port
+        self.baudrate = baudrate
+        self.settings = settings
+        self.pool = pool or default_pool
+        self.max_batch_bytes = max_batch_bytes
+        self._queue = queue.Queue(maxsize)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        # 入队与关闭互斥：关闭后不会再有数据帧进入队列
+        self._enqueue_lock = threading.Lock()
+        self._closing = threading.Event()
+        # 统计信息
+        self.frames_sent = 0
+        self.frames_failed = 0
+        self.bytes_sent = 0
+        self.writes = 0
+
+    @property
+    def queue_depth(self):
+        """当前排队等待发送的帧数"""
+        return self._queue.qsize()
+
+    @property
+    def queue_capacity(self):
+        return self._queue.maxsize
+
+    def enqueue(self, data_bytes, callback=None, block=False, timeout=None):
+        """放入一帧待发送数据
+
+        Args:
+            data_bytes: 完整的数据包字节
+            callback: 发送完成后调用callback(ok, error)，在工作线程中执行
+            block: 队列满时是否等待
+            timeout: 等待的最长时间（秒）
+
+        Returns:
+            bool: 是否已入队，队列满或已关闭时返回False
+        """
+        item = (bytes(data_bytes), callback)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._enqueue_lock:
+                if self._closing.is_set():
+                    return False
+                self._ensure_thread()
+                try:
+                    self._queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    if not block:
+                        return False
+            # 等待时不持有锁，以免阻塞close()
+            wait = 0.01 if deadline is None else min(0.01, deadline - time.monotonic())
+            if wait <= 0:
+                return False
+            time.sleep(wait)
+
+    def close(self, wait=True, timeout=None):
+        """发送完已排队的数据后停止工作线程
+
+        不会阻塞：队列已满时不放入停止标记，由工作线程在队列取空后自行退出。
+        """
+        with self._enqueue_lock:
+            self._closing.set()
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                pass
+        if wait:
+            self.join(timeout)
+
+    def join(self, timeout=None):
+        """等待工作线程退出"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _ensure_thread(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        """阻塞取出一帧，再把队列中已有的帧合并进来，直到达到max_batch_bytes"""
+        item = self._queue.get()
+        if item is _STOP:
+            return None, True
+        batch = [item]
+        size = len(item[0])
+        stop = False
+        while size < self.max_batch_bytes:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch, stop
+
+    def _run(self):
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._write_batch(batch)
+            # 关闭时队列已满、未能放入停止标记的情况：取空后退出
+            if stop or (self._closing.is_set() and self._queue.empty()):
+                break
+
+    def _write_batch(self, batch):
+        if len(batch) == 1:
+            data = batch[0][0]
+        else:
+            data = b''.join([frame for frame, _ in batch])
+        error = None
+        try:
+            self.pool.write(self.port, self.baudrate, data, **self.settings)
+        except (serial.SerialException, OSError) as e:
+            error = e
+        ok = error is None
+        if ok:
+            self.frames_sent += len(batch)
+            self.bytes_sent += len(data)
+            self.writes += 1
+        else:
+            self.frames_failed += len(batch)
+            print(f"发送数据失败: {str(error)}")
+        for _, callback in batch:
+            if callback is not None:
+                try:
+                    callback(ok, error)
+                except Exception as e:
+                    print(f"发送回调出错: {str(e)}")
@@ -0,0 +1,78 @@
+import asyncio
+import errno
+import os
+import pty
+import tty
+
+from protocol.location_security_protocol import LocationSecurityProtocol
+from services.aio_transport import AioSerialTransport
+
+FRAME = LocationSecurityProtocol().serialize_bytes(0x0106, {})
+
+
+class PtySerial:
+    """以pty从端代替串口对象，只提供AioSerialTransport用到的接口"""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.port = os.ttyname(fd)
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_pty_transport():
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    return master, slave, AioSerialTransport(PtySerial(slave))
+
+
+def test_stream_ends_when_pty_master_closes():
+    async def run():
+        master, _, transport = open_pty_transport()
+        os.write(master, FRAME * 3)
+        received = []
+        async for frame in transport:
+            received.append(frame)
+            if len(received) == 3:
+                # 模拟USB转串口拔出
+                os.close(master)
+        transport.close()
+        return received, transport
+
+    received, transport = asyncio.run(asyncio.wait_for(run(), 5))
+    assert received == [FRAME] * 3
+    assert isinstance(transport._error, ConnectionError)
+
+
+def test_read_error_ends_stream(monkeypatch):
+    # 主端关闭后从端读取返回EOF还是EIO因内核而异，这里让从端读取固定抛出EIO
+    real_read = os.read
+    unplugged = set()
+
+    def read(fd, size):
+        if fd in unplugged:
+            raise OSError(errno.EIO, os.strerror(errno.EIO))
+        return real_read(fd, size)
+
+    monkeypatch.setattr(os, 'read', read)
+
+    async def run():
+        master, slave, transport = open_pty_transport()
+        os.write(master, FRAME * 3)
+        received = []
+        async for frame in transport:
+            received.append(frame)
+            if len(received) == 3:
+                unplugged.add(slave)
+                os.close(master)
+        transport.close()
+        return received, transport
+
+    received, transport = asyncio.run(asyncio.wait_for(run(), 5))
+    assert received == [FRAME] * 3
+    assert isinstance(transport._error, ConnectionError)
+    assert transport._error.__cause__.errno == errno.EIO
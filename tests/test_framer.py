@@ -0,0 +1,30 @@
+import pytest
+
+from protocol.crc24q import crc24q_bytes
+from protocol.framer import FrameParser
+from protocol.schema import SCHEMAS
+
+
+def make_frame(message_type, content):
+    length = FrameParser.HEADER_LENGTH + len(content) + FrameParser.CRC_LENGTH
+    frame = (FrameParser.SYNC + bytes([FrameParser.VERSION]) + length.to_bytes(2, 'big')
+             + message_type.to_bytes(2, 'big') + content)
+    return frame + crc24q_bytes(frame)
+
+
+def test_longest_schema_frame_is_accepted():
+    # 0x0103有255个压制干扰条目时为字段表中最长的包
+    entry = {'latitude': 1, 'longitude': 2, 'center_freq': 3, 'bandwidth': 4,
+             'interference_type': 1, 'intensity': 5, 'confidence': 6}
+    content = SCHEMAS[0x0103].encode({'week': 1, 'second': 2, 'entries': [entry] * 255})
+    frame = make_frame(0x0103, content)
+    assert len(frame) == FrameParser.DEFAULT_MAX_LENGTH
+    parser = FrameParser()
+    assert parser.feed(frame[:1000]) == []
+    assert parser.feed(frame[1000:]) == [frame]
+    assert parser.header_errors == 0 and parser.discarded_bytes == 0
+
+
+def test_capacity_must_hold_the_longest_frame():
+    with pytest.raises(ValueError):
+        FrameParser(capacity=FrameParser.DEFAULT_MAX_LENGTH - 1)
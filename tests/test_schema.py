@@ -0,0 +1,31 @@
+from protocol.decoders import decode_frame
+from protocol.location_security_protocol import LocationSecurityProtocol
+
+
+def encode_decode(message_type, content):
+    decoded = decode_frame(LocationSecurityProtocol().serialize_bytes(message_type, content))
+    assert decoded.crc_ok
+    return decoded.content
+
+
+def test_count_fields_parse_decimal_strings():
+    record = encode_decode(0x0102, {'nav_system': 0x21, 'verification_count': '10', 'satellite_number': '12',
+                                    'message_type': '11', 'ref_time': '123456'})
+    assert record.verification_count == 10
+    assert record.satellite_number == 12
+    assert record.nav_message_type == 11
+    assert record.ref_time == bytes.fromhex('123456')
+
+
+def test_hex_fields_parse_hex_strings():
+    entry, = encode_decode(0x0103, {'bandwidth': '10', 'interference_type': '12', 'intensity': 'FF'}).entries
+    assert entry.bandwidth == 0x10
+    assert entry.interference_type == 12
+    assert entry.intensity == 0xFF
+
+
+def test_control_fields_keep_their_bases():
+    record = encode_decode(0x0106, {'target_message_type': '259', 'broadcast_mode': '3', 'interval_time': '10'})
+    assert record.target_message_type == 0x0103
+    assert record.broadcast_mode == 3
+    assert record.interval_time == 0x10
@@ -1,18 +1,23 @@
 from PyQt5.QtWidgets import (QWidget, QFormLayout, QLineEdit, QPushButton, 
                           QHBoxLayout, QVBoxLayout, QComboBox, QLabel, QStackedWidget,
                           QScrollArea, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QRegExpValidator
 from protocol.auxiliary_location_protocol import AuxiliaryLocationProtocol
+from protocol.schema import SCHEMAS
 from services.data_sender import DataSender
 from .serial_port_widget import SerialPortWidget
 
 class AuxiliaryLocationForm(QWidget):
+    # 后台发送完成信号(是否成功, 错误信息)，由发送线程发出、在界面线程处理
+    send_finished = pyqtSignal(bool, str)
+
     def __init__(self):
         super().__init__()
         self.protocol = AuxiliaryLocationProtocol()
         self.serial_port_widget = SerialPortWidget()
         self.data_sender = None  # 延后初始化，发送时用
+        self.send_finished.connect(self.on_send_finished)
         self.init_ui()
         
     def init_ui(self):
@@ -131,202 +136,33 @@ class AuxiliaryLocationForm(QWidget):
         scroll_widget = QWidget()
         scroll_layout = QFormLayout()
         
+        schema_0202 = SCHEMAS[self.protocol.MSG_TYPE_0202]
         # 电文类型号（只读）
+        message_type_field = schema_0202.field('message_type')
         self.message_type_bits = QLineEdit()
         self.message_type_bits.setReadOnly(True)
-        self.message_type_bits.setText("010000010010")  # 12位固定电文类型号
-        scroll_layout.addRow("电文类型号:", self.message_type_bits)
-        
-        # BDS卫星ID
-        self.bds_sat_id = QLineEdit()
-        self.bds_sat_id.setPlaceholderText("输入二进制值（6位）")
-        self.setup_binary_validator(self.bds_sat_id, 6)
-        self.bds_sat_id.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS卫星ID:", self.bds_sat_id)
-        
-        # BDS周计数
-        self.bds_week = QLineEdit()
-        self.bds_week.setPlaceholderText("输入二进制值（13位）")
-        self.setup_binary_validator(self.bds_week, 13)
-        self.bds_week.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS周计数:", self.bds_week)
-        
-        # BDS URAI
-        self.bds_urai = QLineEdit()
-        self.bds_urai.setPlaceholderText("输入二进制值（4位）")
-        self.setup_binary_validator(self.bds_urai, 4)
-        self.bds_urai.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS URAI:", self.bds_urai)
-        
-        # BDS IDOT
-        self.bds_idot = QLineEdit()
-        self.bds_idot.setPlaceholderText("输入二进制值（14位）")
-        self.setup_binary_validator(self.bds_idot, 14)
-        self.bds_idot.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS IDOT:", self.bds_idot)
-        
-        # BDS AODE
-        self.bds_aode = QLineEdit()
-        self.bds_aode.setPlaceholderText("输入二进制值（5位）")
-        self.setup_binary_validator(self.bds_aode, 5)
-        self.bds_aode.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS AODE:", self.bds_aode)
-        
-        # BDS Toc
-        self.bds_toc = QLineEdit()
-        self.bds_toc.setPlaceholderText("输入二进制值（17位）")
-        self.setup_binary_validator(self.bds_toc, 17)
-        self.bds_toc.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Toc:", self.bds_toc)
-        
-        # BDS a2
-        self.bds_a2 = QLineEdit()
-        self.bds_a2.setPlaceholderText("输入二进制值（11位）")
-        self.setup_binary_validator(self.bds_a2, 11)
-        self.bds_a2.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS a2:", self.bds_a2)
-        
-        # BDS a1
-        self.bds_a1 = QLineEdit()
-        self.bds_a1.setPlaceholderText("输入二进制值（22位）")
-        self.setup_binary_validator(self.bds_a1, 22)
-        self.bds_a1.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS a1:", self.bds_a1)
-        
-        # BDS a0
-        self.bds_a0 = QLineEdit()
-        self.bds_a0.setPlaceholderText("输入二进制值（24位）")
-        self.setup_binary_validator(self.bds_a0, 24)
-        self.bds_a0.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS a0:", self.bds_a0)
-        
-        # BDS AODC
-        self.bds_aodc = QLineEdit()
-        self.bds_aodc.setPlaceholderText("输入二进制值（5位）")
-        self.setup_binary_validator(self.bds_aodc, 5)
-        self.bds_aodc.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS AODC:", self.bds_aodc)
-        
-        # BDS Crs
-        self.bds_crs = QLineEdit()
-        self.bds_crs.setPlaceholderText("输入二进制值（18位）")
-        self.setup_binary_validator(self.bds_crs, 18)
-        self.bds_crs.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Crs:", self.bds_crs)
-        
-        # BDS Δn
-        self.bds_delta_n = QLineEdit()
-        self.bds_delta_n.setPlaceholderText("输入二进制值（16位）")
-        self.setup_binary_validator(self.bds_delta_n, 16)
-        self.bds_delta_n.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Δn:", self.bds_delta_n)
-        
-        # BDS M0
-        self.bds_m0 = QLineEdit()
-        self.bds_m0.setPlaceholderText("输入二进制值（32位）")
-        self.setup_binary_validator(self.bds_m0, 32)
-        self.bds_m0.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS M0:", self.bds_m0)
-        
-        # BDS Cuc
-        self.bds_cuc = QLineEdit()
-        self.bds_cuc.setPlaceholderText("输入二进制值（18位）")
-        self.setup_binary_validator(self.bds_cuc, 18)
-        self.bds_cuc.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Cuc:", self.bds_cuc)
-        
-        # BDS e
-        self.bds_e = QLineEdit()
-        self.bds_e.setPlaceholderText("输入二进制值（32位）")
-        self.setup_binary_validator(self.bds_e, 32)
-        self.bds_e.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS e:", self.bds_e)
-        
-        # BDS Cus
-        self.bds_cus = QLineEdit()
-        self.bds_cus.setPlaceholderText("输入二进制值（18位）")
-        self.setup_binary_validator(self.bds_cus, 18)
-        self.bds_cus.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Cus:", self.bds_cus)
-        
-        # BDS 根号a
-        self.bds_sqrt_a = QLineEdit()
-        self.bds_sqrt_a.setPlaceholderText("输入二进制值（32位）")
-        self.setup_binary_validator(self.bds_sqrt_a, 32)
-        self.bds_sqrt_a.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS 根号a:", self.bds_sqrt_a)
-        
-        # BDS toe
-        self.bds_toe = QLineEdit()
-        self.bds_toe.setPlaceholderText("输入二进制值（17位）")
-        self.setup_binary_validator(self.bds_toe, 17)
-        self.bds_toe.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS toe:", self.bds_toe)
-        
-        # BDS Cic
-        self.bds_cic = QLineEdit()
-        self.bds_cic.setPlaceholderText("输入二进制值（18位）")
-        self.setup_binary_validator(self.bds_cic, 18)
-        self.bds_cic.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Cic:", self.bds_cic)
-        
-        # BDS Ω0
-        self.bds_omega0 = QLineEdit()
-        self.bds_omega0.setPlaceholderText("输入二进制值（32位）")
-        self.setup_binary_validator(self.bds_omega0, 32)
-        self.bds_omega0.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Ω0:", self.bds_omega0)
-        
-        # BDS Cis
-        self.bds_cis = QLineEdit()
-        self.bds_cis.setPlaceholderText("输入二进制值（18位）")
-        self.setup_binary_validator(self.bds_cis, 18)
-        self.bds_cis.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Cis:", self.bds_cis)
-        
-        # BDS i0
-        self.bds_i0 = QLineEdit()
-        self.bds_i0.setPlaceholderText("输入二进制值（32位）")
-        self.setup_binary_validator(self.bds_i0, 32)
-        self.bds_i0.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS i0:", self.bds_i0)
-        
-        # BDS Crc
-        self.bds_crc = QLineEdit()
-        self.bds_crc.setPlaceholderText("输入二进制值（18位）")
-        self.bds_crc.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS Crc:", self.bds_crc)
-        
-        # BDS ω
-        self.bds_omega = QLineEdit()
-        self.bds_omega.setPlaceholderText("输入二进制值（32位）")
-        self.bds_omega.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS ω:", self.bds_omega)
-        
-        # BDS OMEGADOT
-        self.bds_omega_dot = QLineEdit()
-        self.bds_omega_dot.setPlaceholderText("输入二进制值（24位）")
-        self.bds_omega_dot.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS OMEGADOT:", self.bds_omega_dot)
-        
-        # BDS TGD1
-        self.bds_tgd1 = QLineEdit()
-        self.bds_tgd1.setPlaceholderText("输入二进制值（10位）")
-        self.bds_tgd1.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS TGD1:", self.bds_tgd1)
-        
-        # BDS TGD2
-        self.bds_tgd2 = QLineEdit()
-        self.bds_tgd2.setPlaceholderText("输入二进制值（10位）")
-        self.bds_tgd2.textChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS TGD2:", self.bds_tgd2)
+        self.message_type_bits.setText(f"{message_type_field.default:0{message_type_field.width}b}")  # 12位固定电文类型号
+        scroll_layout.addRow(f"{message_type_field.label}:", self.message_type_bits)
+        
+        # 星历字段按字段表生成二进制输入框，控件名与字段名相同（健康状态为下拉框，另行创建）
+        self.ephemeris_edits = {}
+        for field in schema_0202.items:
+            if field.name in (None, 'message_type', 'bds_health'):
+                continue
+            edit = QLineEdit()
+            edit.setPlaceholderText(f"输入二进制值（{field.width}位）")
+            self.setup_binary_validator(edit, field.width)
+            edit.textChanged.connect(self.update_packet_length)
+            scroll_layout.addRow(f"{field.label}:", edit)
+            setattr(self, field.name, edit)
+            self.ephemeris_edits[field.name] = edit
         
         # BDS卫星自主健康状态
         self.bds_health_combo = QComboBox()
         self.bds_health_combo.addItem("0 - 健康", 0)
         self.bds_health_combo.addItem("1 - 不健康", 1)
         self.bds_health_combo.currentIndexChanged.connect(self.update_packet_length)
-        scroll_layout.addRow("BDS卫星自主健康状态:", self.bds_health_combo)
+        scroll_layout.addRow(f"{schema_0202.field('bds_health').label}:", self.bds_health_combo)
         
         scroll_widget.setLayout(scroll_layout)
         scroll_area.setWidget(scroll_widget)
@@ -424,33 +260,8 @@ class AuxiliaryLocationForm(QWidget):
             elif self.message_type.currentData() == self.protocol.MSG_TYPE_0202:
                 # 更新0x0202消息类型的字段值
                 self.protocol.message_type = self.protocol.MSG_TYPE_0202
-                self.protocol.set_0202_field('bds_sat_id', self.bds_sat_id.text())
-                self.protocol.set_0202_field('bds_week', self.bds_week.text())
-                self.protocol.set_0202_field('bds_urai', self.bds_urai.text())
-                self.protocol.set_0202_field('bds_idot', self.bds_idot.text())
-                self.protocol.set_0202_field('bds_aode', self.bds_aode.text())
-                self.protocol.set_0202_field('bds_toc', self.bds_toc.text())
-                self.protocol.set_0202_field('bds_a2', self.bds_a2.text())
-                self.protocol.set_0202_field('bds_a1', self.bds_a1.text())
-                self.protocol.set_0202_field('bds_a0', self.bds_a0.text())
-                self.protocol.set_0202_field('bds_aodc', self.bds_aodc.text())
-                self.protocol.set_0202_field('bds_crs', self.bds_crs.text())
-                self.protocol.set_0202_field('bds_delta_n', self.bds_delta_n.text())
-                self.protocol.set_0202_field('bds_m0', self.bds_m0.text())
-                self.protocol.set_0202_field('bds_cuc', self.bds_cuc.text())
-                self.protocol.set_0202_field('bds_e', self.bds_e.text())
-                self.protocol.set_0202_field('bds_cus', self.bds_cus.text())
-                self.protocol.set_0202_field('bds_sqrt_a', self.bds_sqrt_a.text())
-                self.protocol.set_0202_field('bds_toe', self.bds_toe.text())
-                self.protocol.set_0202_field('bds_cic', self.bds_cic.text())
-                self.protocol.set_0202_field('bds_omega0', self.bds_omega0.text())
-                self.protocol.set_0202_field('bds_cis', self.bds_cis.text())
-                self.protocol.set_0202_field('bds_i0', self.bds_i0.text())
-                self.protocol.set_0202_field('bds_crc', self.bds_crc.text())
-                self.protocol.set_0202_field('bds_omega', self.bds_omega.text())
-                self.protocol.set_0202_field('bds_omega_dot', self.bds_omega_dot.text())
-                self.protocol.set_0202_field('bds_tgd1', self.bds_tgd1.text())
-                self.protocol.set_0202_field('bds_tgd2', self.bds_tgd2.text())
+                for name, edit in self.ephemeris_edits.items():
+                    self.protocol.set_0202_field(name, edit.text())
                 self.protocol.set_0202_field('bds_health', format(self.bds_health_combo.currentData(), 'b'))  # 转换为二进制字符串
                 
             # 更新包长度显示
@@ -476,33 +287,42 @@ class AuxiliaryLocationForm(QWidget):
                 self.protocol.data_flag = self.data_flag.currentData()
             else:
                 # 更新0x0202消息类型的字段（使用二进制输入）
-                self.protocol.bds_sat_id = self._parse_binary_input(self.bds_sat_id.text())
-                self.protocol.bds_week = self._parse_binary_input(self.bds_week.text())
-                self.protocol.bds_urai = self._parse_binary_input(self.bds_urai.text())
-                self.protocol.bds_idot = self._parse_binary_input(self.bds_idot.text())
-                self.protocol.bds_aode = self._parse_binary_input(self.bds_aode.text())
-                self.protocol.bds_toc = self._parse_binary_input(self.bds_toc.text())
-                self.protocol.bds_a2 = self._parse_binary_input(self.bds_a2.text())
-                self.protocol.bds_a1 = self._parse_binary_input(self.bds_a1.text())
-                self.protocol.bds_a0 = self._parse_binary_input(self.bds_a0.text())
-                self.protocol.bds_aodc = self._parse_binary_input(self.bds_aodc.text())
-                self.protocol.bds_crs = self._parse_binary_input(self.bds_crs.text())
-                self.protocol.bds_delta_n = self._parse_binary_input(self.bds_delta_n.text())
-                self.protocol.bds_m0 = self._parse_binary_input(self.bds_m0.text())
-                self.protocol.bds_cuc = self._parse_binary_input(self.bds_cuc.text())
-                self.protocol.bds_e = self._parse_binary_input(self.bds_e.text())
-                self.protocol.bds_cus = self._parse_binary_input(self.bds_cus.text())
-                self.protocol.bds_sqrt_a = self._parse_binary_input(self.bds_sqrt_a.text())
-                self.protocol.bds_toe = self._parse_binary_input(self.bds_toe.text())
-                self.protocol.bds_cic = self._parse_binary_input(self.bds_cic.text())
-                self.protocol.bds_omega0 = self._parse_binary_input(self.bds_omega0.text())
-                self.protocol.bds_cis = self._parse_binary_input(self.bds_cis.text())
-                self.protocol.bds_i0 = self._parse_binary_input(self.bds_i0.text())
-                self.protocol.bds_crc = self._parse_binary_input(self.bds_crc.text())
-                self.protocol.bds_omega = self._parse_binary_input(self.bds_omega.text())
-                self.protocol.bds_omega_dot = self._parse_binary_input(self.bds_omega_dot.text())
-                self.protocol.bds_tgd1 = self._parse_binary_input(self.bds_tgd1.text())
-                self.protocol.bds_tgd2 = self._parse_binary_input(self.bds_tgd2.text())
+                for name, edit in self.ephemeris_edits.items():
+                    setattr(self.protocol, name, self._parse_binary_input(edit.text()))
+                self.protocol.bds_health = self.bds_health_combo.currentData()
+            
+            # 序列化数据
+            data = self.protocol.serialize()
+            
+            # 更新CRC显示
+            crc = data[-3:]
+            self.crc_value.setText(f"0x{int.from_bytes(crc, 'big'):06X}")
+            
+            # 显示完整的十六进制数据
+            hex_data = ' '.join(f"{b:02X}" for b in data)
+            preview_text = "完整数据包（十六进制）：\n" + hex_data
+            self.preview_label.setText(preview_text)
+            
+        except ValueError as e:
+            self.preview_label.setText(f"错误：{str(e)}")
+    
+    def send_data(self):
+        try:
+            msg_type = self.message_type.currentData()
+            self.protocol.message_type = msg_type
+            
+            if msg_type == self.protocol.MSG_TYPE_0201:
+                # 更新0x0201消息类型的字段
+                self.protocol.pos_x = self._parse_hex_input(self.pos_x.text(), 4)
+                self.protocol.pos_y = self._parse_hex_input(self.pos_y.text(), 4)
+                self.protocol.pos_z = self._parse_hex_input(self.pos_z.text(), 4)
+                self.protocol.pos_error = self._parse_hex_input(self.pos_error.text(), 2)
+                self.protocol.time_error = self._parse_hex_input(self.time_error.text(), 2)
+                self.protocol.data_flag = self.data_flag.currentData()
+            else:
+                # 更新0x0202消息类型的字段（使用二进制输入）
+                for name, edit in self.ephemeris_edits.items():
+                    setattr(self.protocol, name, self._parse_binary_input(edit.text()))
                 self.protocol.bds_health = self.bds_health_combo.currentData()
             
             # 序列化数据
@@ -566,20 +386,35 @@ class AuxiliaryLocationForm(QWidget):
             
             # 序列化数据并发送
             data = self.protocol.serialize()
-            hex_data = ''.join(f"{b:02X}" for b in data)
             port = self.serial_port_widget.get_selected_port()
             baudrate = self.serial_port_widget.get_selected_baudrate()
             if not port:
                 self.preview_label.setText("请选择串口！")
                 return
-            self.data_sender = DataSender(port=port, baudrate=baudrate)
-            self.data_sender.send_data(hex_data)
-            
-            self.preview_label.setText("数据发送成功！")
+            # 复用发送器，串口连接由连接池保持
+            if (self.data_sender is None or self.data_sender.port != port
+                    or self.data_sender.baudrate != baudrate):
+                if self.data_sender is not None:
+                    self.data_sender.close(wait=False)
+                self.data_sender = DataSender(port=port, baudrate=baudrate)
+            if self.data_sender.send_bytes_async(data, self._on_frame_sent):
+                self.preview_label.setText(f"数据已加入发送队列（待发送{self.data_sender.queue_depth}帧）")
+            else:
+                self.preview_label.setText("发送失败：发送队列已满，请稍后再试")
             
         except ValueError as e:
             self.preview_label.setText(f"发送失败：{str(e)}")
 
+    def _on_frame_sent(self, ok, error):
+        """发送线程回调，转为信号交给界面线程"""
+        self.send_finished.emit(ok, str(error) if error else "")
+
+    def on_send_finished(self, ok, error):
+        if ok:
+            self.preview_label.setText("数据发送成功！")
+        else:
+            self.preview_label.setText(f"发送失败：{error}")
+
     def validate_hex_input(self, text: str, max_bits: int) -> bool:
         """验证十六进制输入
         
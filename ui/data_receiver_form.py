@@ -5,52 +5,121 @@ from PyQt5.QtCore import Qt, QRegExp, QThread, pyqtSignal
 from PyQt5.QtGui import QRegExpValidator
 from protocol.location_security_protocol import LocationSecurityProtocol
 from protocol.auxiliary_location_protocol import AuxiliaryLocationProtocol
+from protocol.crc24q import crc24q
+from protocol.framer import FrameParser
+from protocol.decoders import decode_content, DecodeError
+from protocol.schema import SCHEMAS, Group
 from .serial_port_widget import SerialPortWidget
 from services.data_sender import DataSender
-import serial
+from services.serial_pool import default_pool
+from services.frame_dispatcher import FrameDispatcher
+from collections import Counter
 import time
 import re
 
+class LatencyStats:
+    """接收端处理延迟统计（秒）
+
+    从本批数据的第一次read()返回起，到数据包分发完成为止。只反映接收线程
+    自身的读取、分包和分发耗时；数据在对端、线路和串口驱动缓冲区中等待
+    被读出的时间不计入（需要对端发送时间戳才能测量），不是端到端延迟。
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, latency):
+        self.count += 1
+        self.total += latency
+        if latency > self.max:
+            self.max = latency
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
 class SerialReceiveThread(QThread):
-    data_received = pyqtSignal(bytes)
-    def __init__(self, port, baudrate, parent=None):
+    # 解析出的数据包按批发送给界面线程，每秒最多max_batches_per_second次
+    frames_received = pyqtSignal(list)
+    def __init__(self, port, baudrate, parent=None, max_batches_per_second=20,
+                 dispatcher=None, display_types=(0x0105, 0x0106)):
         super().__init__(parent)
         self.port = port
         self.baudrate = baudrate
         self._running = True
+        self.batch_interval = 1.0 / max_batches_per_second
+        self.latency = LatencyStats()
+        self.bytes_received = 0
+        # 解析出的包经分发器交给各订阅者（统计、日志等），界面只订阅display_types类型
+        self.dispatcher = dispatcher or FrameDispatcher()
+        self._batch = []
+        self._display_token = self.dispatcher.subscribe(self._collect_for_display, display_types)
+    def _collect_for_display(self, message_type, frame):
+        self._batch.append(frame)
+    def read_available(self, ser):
+        """等待数据到达并一次读出驱动中已缓存的全部字节
+
+        没有数据时read在串口读超时内阻塞等待（POSIX下由select实现），
+        有数据立即返回，不再轮询休眠；块大小随in_waiting自适应。
+
+        Returns:
+            (data, arrival): 读到的字节和第一次read()返回的时间（perf_counter），
+                作为处理延迟的起点；没有数据时为(b'', None)
+        """
+        data = ser.read(max(1, ser.in_waiting))
+        if not data:
+            return data, None
+        arrival = time.perf_counter()
+        waiting = ser.in_waiting
+        if waiting:
+            data += ser.read(waiting)
+        return data, arrival
     def run(self):
         try:
-            with serial.Serial(self.port, self.baudrate, timeout=0.2) as ser:
-                buffer = b''
+            # 与发送界面共用连接池中的串口
+            with default_pool.connection(self.port, self.baudrate) as ser:
+                parser = FrameParser()
+                dispatcher = self.dispatcher
+                last_emit = time.monotonic()
                 while self._running:
-                    data = ser.read(512)
+                    data, arrival = self.read_available(ser)
                     if data:
-                        buffer += data
-                        # 尝试按包头和长度分包（假设包头4字节+1+2+2=9字节，包长在第5-7字节）
-                        while len(buffer) >= 9:
-                            length = int.from_bytes(buffer[5:7], 'big')
-                            if len(buffer) < length:
-                                break
-                            packet = buffer[:length]
-                            msg_type = int.from_bytes(packet[7:9], 'big')
-                            if msg_type in (0x0105, 0x0106):
-                                self.data_received.emit(packet)
-                            buffer = buffer[length:]
-                    else:
-                        time.sleep(0.05)
+                        self.bytes_received += len(data)
+                        for packet in parser.feed_views(data):
+                            if dispatcher.dispatch(packet):
+                                self.latency.add(time.perf_counter() - arrival)
+                    # 攒够一个发送间隔再整批交给界面，避免每包一个信号堵塞Qt事件队列
+                    now = time.monotonic()
+                    if self._batch and now - last_emit >= self.batch_interval:
+                        self.frames_received.emit(self._batch)
+                        self._batch = []
+                        last_emit = now
+                if self._batch:
+                    self.frames_received.emit(self._batch)
+                    self._batch = []
         except Exception as e:
             pass
+        finally:
+            self.dispatcher.unsubscribe(self._display_token)
     def stop(self):
         self._running = False
         self.wait()
 
 class DataReceiverForm(QWidget):
+    # 辅助定位消息类型（0x0201、0x0202）的高字节
+    AUXILIARY_TYPE_HIGH_BYTE = AuxiliaryLocationProtocol.MSG_TYPE_0201 >> 8
+
     def __init__(self):
         super().__init__()
         self.location_security_protocol = LocationSecurityProtocol()
         self.auxiliary_location_protocol = AuxiliaryLocationProtocol()
         self.serial_port_widget = SerialPortWidget()
         self.receive_thread = None
+        self.received_count = 0
+        self.type_counts = Counter()  # 各消息类型的接收包数
         self.init_ui()
         
     def init_ui(self):
@@ -66,6 +135,13 @@ class DataReceiverForm(QWidget):
         self.stop_button.clicked.connect(self.stop_serial_receive)
         layout.addWidget(self.receive_button)
         layout.addWidget(self.stop_button)
+        # 串口接收时显示的消息类型
+        display_layout = QHBoxLayout()
+        display_layout.addWidget(QLabel("显示消息类型:"))
+        self.display_types_edit = QLineEdit("0105,0106")
+        self.display_types_edit.setPlaceholderText("16进制消息类型，逗号分隔，留空显示全部")
+        display_layout.addWidget(self.display_types_edit)
+        layout.addLayout(display_layout)
         
         # 创建协议选择区域
         protocol_layout = QHBoxLayout()
@@ -165,6 +241,7 @@ class DataReceiverForm(QWidget):
                 content_bytes = data_bytes[9:length-3]  # 去掉头部和CRC
                 result += "\n\n消息内容:\n"
                 result += self.parse_security_content(msg_type, content_bytes)
+                result += self.check_crc(data_bytes, length)
             
             self.result_text.setText(result)
             
@@ -210,260 +287,86 @@ class DataReceiverForm(QWidget):
                 content_bytes = data_bytes[9:length-3]  # 去掉头部和CRC
                 result += "\n\n消息内容:\n"
                 result += self.parse_auxiliary_content(msg_type, content_bytes)
+                result += self.check_crc(data_bytes, length)
             
             self.result_text.setText(result)
             
         except Exception as e:
             self.result_text.setText(f'解析错误: {str(e)}')
             
+    def check_crc(self, data_bytes, length):
+        """校验CRC-24Q，返回校验结果文本"""
+        if length < 12:
+            return ""
+        received_crc = int.from_bytes(data_bytes[length-3:length], 'big')
+        calculated_crc = crc24q(memoryview(data_bytes)[:length-3])
+        if received_crc == calculated_crc:
+            return f"\n\nCRC-24Q校验: 通过 (0x{received_crc:06X})"
+        return f"\n\nCRC-24Q校验: 失败 (接收 0x{received_crc:06X}, 计算 0x{calculated_crc:06X})"
+            
     def parse_security_content(self, msg_type, content_bytes):
         """解析定位安全数据包的消息内容"""
-        result = ""
-        try:
-            if msg_type == 0x0101:
-                # 解析卫星导航系统服务状态信息
-                if len(content_bytes) >= 28:
-                    week = int.from_bytes(content_bytes[0:2], 'big')
-                    second = int.from_bytes(content_bytes[2:6], 'big')
-                    nav_system = content_bytes[6]
-                    nav_status = content_bytes[7]
-                    signal_status = content_bytes[8:12]
-                    satellite_status = content_bytes[12:20]
-                    
-                    result += f"BDS参考周计数: {week}\n"
-                    result += f"BDS参考周内秒: {second}\n"
-                    result += f"导航系统标识: 0x{nav_system:02X}\n"
-                    result += f"导航系统状态: 0x{nav_status:02X}\n"
-                    result += f"导航信号状态: {' '.join(f'{b:02X}' for b in signal_status)}\n"
-                    result += f"导航卫星状态: {' '.join(f'{b:02X}' for b in satellite_status)}"
-                    
-            elif msg_type == 0x0102:
-                # 解析卫星导航系统导航电文验证信息
-                if len(content_bytes) >= 14:
-                    week = int.from_bytes(content_bytes[0:2], 'big')
-                    second = int.from_bytes(content_bytes[2:6], 'big')
-                    nav_system = content_bytes[6]
-                    verification_count = content_bytes[7]
-                    satellite_number = content_bytes[8]
-                    message_type = content_bytes[9]
-                    ref_time = content_bytes[10:13]
-                    
-                    result += f"BDS参考周计数: {week}\n"
-                    result += f"BDS参考周内秒: {second}\n"
-                    result += f"导航系统标识: 0x{nav_system:02X}\n"
-                    result += f"验证计数: {verification_count}\n"
-                    result += f"卫星编号: {satellite_number}\n"
-                    result += f"电文类型: 0x{message_type:02X}\n"
-                    result += f"参考时间: {' '.join(f'{b:02X}' for b in ref_time)}"
-                    
-            elif msg_type == 0x0103:
-                # 解析压制干扰告警信息
-                if len(content_bytes) >= 19:
-                    week = int.from_bytes(content_bytes[0:2], 'big')
-                    second = int.from_bytes(content_bytes[2:6], 'big')
-                    count = content_bytes[6]
-                    latitude = content_bytes[7:11]
-                    longitude = content_bytes[11:15]
-                    center_freq = content_bytes[15:17]
-                    interference_type = content_bytes[17]
-                    intensity = content_bytes[18]
-                    
-                    result += f"BDS参考周计数: {week}\n"
-                    result += f"BDS参考周内秒: {second}\n"
-                    result += f"压制干扰数目: {count}\n"
-                    result += f"纬度: {' '.join(f'{b:02X}' for b in latitude)}\n"
-                    result += f"经度: {' '.join(f'{b:02X}' for b in longitude)}\n"
-                    result += f"中心频率: {' '.join(f'{b:02X}' for b in center_freq)}\n"
-                    result += f"干扰类型: 0x{interference_type:02X}\n"
-                    result += f"干扰强度: 0x{intensity:02X}"
-                    
-            elif msg_type == 0x0104:
-                # 解析欺骗干扰告警信息
-                if len(content_bytes) >= 15:
-                    week = int.from_bytes(content_bytes[0:2], 'big')
-                    second = int.from_bytes(content_bytes[2:6], 'big')
-                    count = content_bytes[6]
-                    latitude = content_bytes[7:11]
-                    longitude = content_bytes[11:15]
-                    
-                    result += f"BDS参考周计数: {week}\n"
-                    result += f"BDS参考周内秒: {second}\n"
-                    result += f"欺骗干扰数目: {count}\n"
-                    result += f"纬度: {' '.join(f'{b:02X}' for b in latitude)}\n"
-                    result += f"经度: {' '.join(f'{b:02X}' for b in longitude)}"
-                    
-            elif msg_type == 0x0105:
-                # 解析模块干扰检测信息，严格按照k/n/m值和数据长度输出
-                print("content_bytes:", content_bytes.hex(), "len:", len(content_bytes))
-                offset = 0
-                if len(content_bytes) < 41:
-                    return "数据长度不足，无法解析完整字段"
-                # 1. 定位状态 (2字节)
-                pos_status = int.from_bytes(content_bytes[offset:offset+2], 'big')
-                result += f"1. 定位状态 (UINT16, 2字节): {pos_status:04X}\n"
-                offset += 2
-                # 2. 参考周计数 (2字节)
-                week = int.from_bytes(content_bytes[offset:offset+2], 'big')
-                result += f"2. 参考周计数 (UINT16, 2字节): {week:04X}\n"
-                offset += 2
-                # 3. 参考周内秒 (4字节)
-                second = int.from_bytes(content_bytes[offset:offset+4], 'big')
-                result += f"3. 参考周内秒 (UINT32, 4字节): {second:08X}\n"
-                offset += 4
-                # 4. 纬度 (4字节)
-                latitude = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"4. 纬度 (INT32, 4字节): {latitude:08X}\n"
-                offset += 4
-                # 5. 经度 (4字节)
-                longitude = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"5. 经度 (INT32, 4字节): {longitude:08X}\n"
-                offset += 4
-                # 6. 大地高 (4字节)
-                height = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"6. 大地高 (INT32, 4字节): {height:08X}\n"
-                offset += 4
-                # 7. 水平速度 (4字节)
-                v_n = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"7. 水平速度 (INT32, 4字节): {v_n:08X}\n"
-                offset += 4
-                # 8. 垂直速度 (4字节)
-                v_e = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"8. 垂直速度 (INT32, 4字节): {v_e:08X}\n"
-                offset += 4
-                # 9. 运动航向 (4字节)
-                v_u = int.from_bytes(content_bytes[offset:offset+4], 'big', signed=True)
-                result += f"9. 运动航向 (INT32, 4字节): {v_u:08X}\n"
-                offset += 4
-                # 10. 水平精度因子 (2字节)
-                hdop = int.from_bytes(content_bytes[offset:offset+2], 'big')
-                result += f"10. 水平精度因子 (UINT16, 2字节): {hdop:04X}\n"
-                offset += 2
-                # 11. 参与定位导航信号 (4字节)
-                nav_signal = int.from_bytes(content_bytes[offset:offset+4], 'big')
-                result += f"11. 参与定位导航信号 (UINT32, 4字节): {nav_signal:08X}\n"
-                offset += 4
-                # 12. 参与定位卫星总数 (1字节)
-                total_sats = content_bytes[offset]
-                result += f"12. 参与定位卫星总数 (UINT8, 1字节): {total_sats:02X}\n"
-                offset += 1
-                # 13. 参与定位北斗卫星数 (1字节)
-                bds_sats = content_bytes[offset]
-                result += f"13. 参与定位北斗卫星数 (UINT8, 1字节): {bds_sats:02X}\n"
-                offset += 1
-                # 14. RAIM监测发现的故障信号数k (1字节)
-                raim_k = content_bytes[offset]
-                result += f"14. RAIM监测发现的故障信号数k (INT8, 1字节): {raim_k:02X} (k={raim_k})\n"
-                offset += 1
-                if raim_k == 1:
-                    result += f"\n由于k=1，数据项15~17存在：\n"
-                    if offset+2 <= len(content_bytes):
-                        raim_prn = content_bytes[offset]
-                        raim_id = content_bytes[offset+1]
-                        result += f"第1个故障信号的卫星编号 (UINT8, 1字节): {raim_prn:02X}\n"
-                        result += f"第1个故障信号的信号标识 (UINT8, 1字节): {raim_id:02X}\n"
-                        offset += 2
-                    else:
-                        result += "数据不足\n"
-                # 15. 压制干扰数目n (1字节)
-                print("offset before jam_n:", offset)
-                if offset < len(content_bytes):
-                    jam_n = content_bytes[offset]
-                    result += f"\n压制干扰数目n (INT8, 1字节): {jam_n:02X} (n={jam_n})\n"
-                    offset += 1
-                    if jam_n == 1:
-                        result += f"\n由于n=1，数据项19~22存在：\n"
-                        if offset + 8 <= len(content_bytes):
-                            jam_freq = int.from_bytes(content_bytes[offset:offset+4], 'big')
-                            jam_bw = int.from_bytes(content_bytes[offset+4:offset+6], 'big')
-                            jam_type = content_bytes[offset+6]
-                            jam_strength = content_bytes[offset+7]
-                            result += f"压制干扰中心频率 (UINT32, 4字节): {jam_freq:08X}\n"
-                            result += f"压制干扰带宽 (UINT16, 2字节): {jam_bw:04X}\n"
-                            result += f"压制干扰类型 (UINT8, 1字节): {jam_type:02X}\n"
-                            result += f"压制干扰强度 (UINT8, 1字节): {jam_strength:02X}\n"
-                            offset += 8
-                        else:
-                            result += "数据不足\n"
-                else:
-                    result += "\n压制干扰数目n (INT8, 1字节): 数据不足\n"
-                # 16. 欺骗干扰数目m (1字节)
-                print("offset before spoof_m:", offset)
-                if offset < len(content_bytes):
-                    spoof_m = content_bytes[offset]
-                    result += f"\n欺骗干扰数目m (INT8, 1字节): {spoof_m:02X} (m={spoof_m})\n"
-                    offset += 1
-                    if spoof_m == 1:
-                        result += f"\n由于m=1，数据项25存在：\n"
-                        if offset < len(content_bytes):
-                            spoof_id = content_bytes[offset]
-                            result += f"欺骗干扰的卫星导航信号 (UINT8, 1字节): {spoof_id:02X}\n"
-                            offset += 1
-                        else:
-                            result += "数据不足\n"
-                else:
-                    result += "\n欺骗干扰数目m (INT8, 1字节): 数据不足\n"
-                return result
-            
-            elif msg_type == 0x0106:
-                # 解析信息交互控制指令
-                if len(content_bytes) >= 5:
-                    target_type = int.from_bytes(content_bytes[0:2], 'big')
-                    broadcast_mode = content_bytes[2]
-                    interval_time = content_bytes[3]
-                    offset_time = content_bytes[4]
-                    
-                    result += f"目标消息类型: 0x{target_type:04X}\n"
-                    result += f"播发模式: 0x{broadcast_mode:02X}\n"
-                    result += f"间隔时间: 0x{interval_time:02X}\n"
-                    result += f"偏移时间: 0x{offset_time:02X}"
-            
-            return result
-            
-        except Exception as e:
-            return f"内容解析错误: {str(e)}"
-            
+        return self.parse_content(msg_type, content_bytes)
+
     def parse_auxiliary_content(self, msg_type, content_bytes):
         """解析辅助定位数据包的消息内容"""
-        result = ""
+        return self.parse_content(msg_type, content_bytes)
+
+    def parse_content(self, msg_type, content_bytes):
         try:
-            if msg_type == self.auxiliary_location_protocol.MSG_TYPE_0201:
-                # 解析位置时间辅助信息
-                if len(content_bytes) >= 24:
-                    pos_x = int.from_bytes(content_bytes[0:4], 'big')
-                    pos_y = int.from_bytes(content_bytes[4:8], 'big')
-                    pos_z = int.from_bytes(content_bytes[8:12], 'big')
-                    week = int.from_bytes(content_bytes[12:14], 'big')
-                    second = int.from_bytes(content_bytes[14:18], 'big')
-                    pos_error = int.from_bytes(content_bytes[18:20], 'big')
-                    time_error = int.from_bytes(content_bytes[20:22], 'big')
-                    data_flag = content_bytes[22]
-                    reserved = content_bytes[23]
-                    
-                    result += f"概略位置X: 0x{pos_x:08X}\n"
-                    result += f"概略位置Y: 0x{pos_y:08X}\n"
-                    result += f"概略位置Z: 0x{pos_z:08X}\n"
-                    result += f"当前时间周计数: {week}\n"
-                    result += f"当前时间周内秒: {second}\n"
-                    result += f"位置误差: 0x{pos_error:04X}\n"
-                    result += f"时间误差: 0x{time_error:04X}\n"
-                    result += f"数据有效标志: 0x{data_flag:02X}\n"
-                    result += f"保留字段: 0x{reserved:02X}"
-                    
-            elif msg_type == self.auxiliary_location_protocol.MSG_TYPE_0202:
-                # 解析BDS星历辅助信息
-                result += f"原始数据: {' '.join(f'{b:02X}' for b in content_bytes)}"
-            
-            return result
-            
+            record = decode_content(msg_type, content_bytes)
+        except DecodeError as e:
+            return str(e)
         except Exception as e:
-            return f"内容解析错误: {str(e)}" 
+            return f"内容解析错误: {str(e)}"
+        return self.render_record(msg_type, record)
 
-    def handle_serial_data(self, data):
-        # 只显示最新的0x0105/0x0106类型数据
-        if self.security_radio.isChecked():
-            self.parse_security_packet(data)
+    def render_record(self, msg_type, record):
+        """按字段表把消息记录格式化为显示文本（只对界面上显示的包调用）
+
+        各组条目逐个输出为"第i个..."；有比例因子的字段在括号中附物理量。
+        """
+        schema = SCHEMAS.get(msg_type)
+        if schema is None:
+            return f"不支持的消息类型: 0x{msg_type:04X}"
+        lines = []
+        for item in schema.items:
+            if isinstance(item, Group):
+                entries = getattr(record, item.name)
+                lines.append(self._format_field(schema.field(item.count), len(entries)))
+                for i, entry in enumerate(entries, 1):
+                    if len(item.fields) == 1:
+                        entry = (entry,)
+                    lines += [self._format_field(field, value, f"第{i}个")
+                              for field, value in zip(item.fields, entry)]
+            elif item.name is not None:
+                lines.append(self._format_field(item, getattr(record, item.name)))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_field(field, value, prefix=""):
+        if field.raw:
+            text = ' '.join(f'{b:02X}' for b in value)
+        elif field.display == 'dec':
+            text = str(value)
         else:
+            text = f"0x{value & ((1 << field.width) - 1):0{(field.width + 3) // 4}X}"
+        if field.scale != 1:
+            text += f" ({field.physical(value):g})"
+        return f"{prefix}{field.label}: {text}"
+
+    def handle_serial_data(self, data):
+        # 只显示最新的一包数据；串口上两种协议的包混在一起，按消息类型高字节选择解析方式
+        if len(data) > 7 and data[7] == self.AUXILIARY_TYPE_HIGH_BYTE:
             self.parse_auxiliary_packet(data)
+        else:
+            self.parse_security_packet(data)
+
+    def handle_serial_frames(self, frames):
+        """处理一批数据包，只解析显示其中最新的一包并汇总包数"""
+        self.received_count += len(frames)
+        self.handle_serial_data(frames[-1])
+        self.result_text.append(f"\n本批 {len(frames)} 包，累计接收 {self.received_count} 包")
 
     def start_serial_receive(self):
         port = self.serial_port_widget.get_selected_port()
@@ -471,17 +374,53 @@ class DataReceiverForm(QWidget):
         if not port:
             self.result_text.setText("请选择串口！")
             return
-        self.result_text.setText("正在接收... 只显示0x0105/0x0106类型数据")
+        try:
+            display_types = self.get_display_types()
+        except ValueError:
+            self.result_text.setText("显示消息类型格式错误！")
+            return
+        if display_types is None:
+            self.result_text.setText("正在接收... 显示全部类型数据")
+        else:
+            self.result_text.setText("正在接收... 只显示"
+                                     + "/".join(f"0x{t:04X}" for t in display_types) + "类型数据")
         self.receive_button.setEnabled(False)
         self.stop_button.setEnabled(True)
-        self.receive_thread = SerialReceiveThread(port, baudrate)
-        self.receive_thread.data_received.connect(self.handle_serial_data)
+        self.received_count = 0
+        self.type_counts.clear()
+        dispatcher = FrameDispatcher()
+        # 统计订阅全部类型，不受显示过滤影响
+        dispatcher.subscribe(self._count_frame)
+        self.receive_thread = SerialReceiveThread(port, baudrate, dispatcher=dispatcher,
+                                                  display_types=display_types)
+        self.receive_thread.frames_received.connect(self.handle_serial_frames)
         self.receive_thread.start()
 
     def stop_serial_receive(self):
+        latency = None
         if self.receive_thread:
             self.receive_thread.stop()
+            latency = self.receive_thread.latency
             self.receive_thread = None
         self.receive_button.setEnabled(True)
         self.stop_button.setEnabled(False)
-        self.result_text.append("已停止接收") 
\ No newline at end of file
+        self.result_text.append("已停止接收")
+        if latency is not None and latency.count:
+            self.result_text.append(
+                f"接收处理延迟（读出后至分发，不含串口缓冲等待）: 平均 {latency.mean * 1000:.3f} ms, "
+                f"最大 {latency.max * 1000:.3f} ms ({latency.count} 包)")
+        if self.type_counts:
+            self.result_text.append("各类型包数: " + ", ".join(
+                f"0x{t:04X}: {n}" for t, n in sorted(self.type_counts.items())))
+
+    def _count_frame(self, message_type, frame):
+        # 在接收线程中调用，停止接收后再读取
+        self.type_counts[message_type] += 1
+
+    def get_display_types(self):
+        """解析显示消息类型输入，留空返回None（显示全部）"""
+        text = self.display_types_edit.text()
+        items = [item for item in re.split(r'[\s,，]+', text) if item]
+        if not items:
+            return None
+        return tuple(int(item, 16) for item in items) 
\ No newline at end of file
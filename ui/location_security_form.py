@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QWidget, QFormLayout, QLineEdit, QComboBox, QPushButton, QHBoxLayout, QLabel, QVBoxLayout, QMessageBox
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QRegExp, pyqtSignal
 from PyQt5.QtGui import QIntValidator, QRegExpValidator
 import re
 from services.data_sender import DataSender
@@ -7,6 +7,9 @@ from protocol.location_security_protocol import LocationSecurityProtocol
 from .serial_port_widget import SerialPortWidget
 
 class LocationSecurityForm(QWidget):
+    # 后台发送完成信号(是否成功, 错误信息)，由发送线程发出、在界面线程处理
+    send_finished = pyqtSignal(bool, str)
+
     def __init__(self, parent=None):
         super().__init__()
         self.protocol = LocationSecurityProtocol()
@@ -15,6 +18,7 @@ class LocationSecurityForm(QWidget):
         self.current_message_type = 0x0101  # Default message type
         self.message_content = {}  # Initialize message_content
         self.initial_bds_week, self.initial_bds_second = self.protocol._get_bds_week_and_second()
+        self.send_finished.connect(self.on_send_finished)
         self.init_ui()
 
     def init_ui(self):
@@ -537,7 +541,7 @@ class LocationSecurityForm(QWidget):
                 'nav_system': self.nav_system_combo.currentData(),
                 'verification_count': self.verification_count_edit.text(),
                 'satellite_number': self.satellite_number_edit.text(),
-                'message_type': self.nav_message_type_combo.currentData(),
+                'nav_message_type': self.nav_message_type_combo.currentData(),
                 'ref_time': self.ref_time_edit.text(),
                 'verification_word': self.verification_word_edit.text()
             }
@@ -587,7 +591,7 @@ class LocationSecurityForm(QWidget):
                     'nav_system': self.nav_system_combo.currentData(),
                     'verification_count': self.verification_count_edit.text(),
                     'satellite_number': self.satellite_number_edit.text(),
-                    'message_type': self.nav_message_type_combo.currentData(),
+                    'nav_message_type': self.nav_message_type_combo.currentData(),
                     'ref_time': self.ref_time_edit.text(),
                     'verification_word': self.verification_word_edit.text()
                 }
@@ -652,7 +656,7 @@ class LocationSecurityForm(QWidget):
                 return
 
             # 序列化数据
-            data_hex = self.protocol.serialize(self.current_message_type, message_content)
+            data_bytes = self.protocol.serialize_bytes(self.current_message_type, message_content)
             # 获取串口和波特率
             port = self.serial_port_widget.get_selected_port()
             baudrate = self.serial_port_widget.get_selected_baudrate()
@@ -660,8 +664,14 @@ class LocationSecurityForm(QWidget):
                 QMessageBox.warning(self, "错误", "请选择串口！")
                 return
             # 发送数据
-            self.data_sender = DataSender(port=port, baudrate=baudrate)
-            self.data_sender.send_data(data_hex)
+            # 复用发送器，串口连接由连接池保持
+            if (self.data_sender is None or self.data_sender.port != port
+                    or self.data_sender.baudrate != baudrate):
+                if self.data_sender is not None:
+                    self.data_sender.close(wait=False)
+                self.data_sender = DataSender(port=port, baudrate=baudrate)
+            if not self.data_sender.send_bytes_async(data_bytes, self._on_frame_sent):
+                QMessageBox.warning(self, "错误", f"发送队列已满（{self.data_sender.queue_depth}帧待发送），请稍后再试")
             
             
         except Exception as e:
@@ -669,6 +679,14 @@ class LocationSecurityForm(QWidget):
             import traceback
             traceback.print_exc()
 
+    def _on_frame_sent(self, ok, error):
+        """发送线程回调，转为信号交给界面线程"""
+        self.send_finished.emit(ok, str(error) if error else "")
+
+    def on_send_finished(self, ok, error):
+        if not ok:
+            QMessageBox.warning(self, "错误", f"发送数据失败：{error}")
+
     def update_crc_value(self):
         """更新CRC-24Q校验值显示"""
         if not hasattr(self, 'crc_edit'):
@@ -677,11 +695,10 @@ class LocationSecurityForm(QWidget):
         # 收集当前内容
         self.update_message_content()
         # 序列化数据以获取包含CRC的完整数据包
-        data_hex = self.protocol.serialize(self.current_message_type, self.message_content)
-        # 提取CRC部分（最后6个字符，3字节=6个十六进制字符）
-        if len(data_hex) >= 6:
-            crc_hex = data_hex[-6:]
-            self.crc_edit.setText(crc_hex)
+        data_bytes = self.protocol.serialize_bytes(self.current_message_type, self.message_content)
+        # 提取CRC部分（最后3字节）
+        if len(data_bytes) >= 3:
+            self.crc_edit.setText(data_bytes[-3:].hex().upper())
         else:
             self.crc_edit.setText("")
 
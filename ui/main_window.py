@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout,QDeskt
 from .location_security_form import LocationSecurityForm
 from .auxiliary_location_form import AuxiliaryLocationForm
 from .data_receiver_form import DataReceiverForm
+from services.serial_pool import default_pool
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -35,6 +36,7 @@ class MainWindow(QMainWindow):
         tab_widget.addTab(data_receiver_form, "数据解析")
         
         layout.addWidget(tab_widget)
+        self.sender_forms = (location_security_form, auxiliary_location_form)
         
         # 设置窗口大小
         self.setGeometry(100, 100, 800, 1600)
@@ -43,4 +45,12 @@ class MainWindow(QMainWindow):
         frame_geom = self.frameGeometry()
         screen_center = QDesktopWidget().availableGeometry().center()
         frame_geom.moveCenter(screen_center)
-        self.move(frame_geom.topLeft())
\ No newline at end of file
+        self.move(frame_geom.topLeft())
+
+    def closeEvent(self, event):
+        # 退出时先发完已排队的数据，再关闭连接池中的全部串口
+        for form in self.sender_forms:
+            if form.data_sender is not None:
+                form.data_sender.close(wait=True)
+        default_pool.close_all()
+        super().closeEvent(event)